@@ -46,6 +46,8 @@ INSTALLED_APPS = [
     'position',
     'job',
     'client',
+    'exports',
+    'imports',
     'drf_spectacular',
 ]
 
@@ -94,6 +96,24 @@ DATABASES = {
     }
 }
 
+# Shared by every worker: login throttling counters, job board versions and locks, and user claim
+# generations only work if all processes see the same values. REDIS_URL selects Redis; otherwise
+# the database cache table is used (python manage.py createcachetable).
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -120,10 +140,81 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),
     'REFRESH_TOKEN_LIFETIME': timedelta(minutes=120),
     'ROTATE_REFRESH_TOKENS': True,
-    'BLACKLIST_AFTER_ROTATION': True, # NOT WORKING (one device per session) - Not installed in the INSTALLED_APPS
+    'BLACKLIST_AFTER_ROTATION': True, # Enforced by auth.revocation, not the token_blacklist app
     'ALGORITHM': 'HS256',
 }
 
+# Per-process LRU of the user columns re-checked on every authenticated request. BACKEND holds a
+# per-user generation that each worker re-reads at most every GENERATION_CHECK_INTERVAL seconds, so
+# lockouts and role changes reach all workers within that interval without a cache round trip per
+# request. With BACKEND = None entries are per process and other workers see changes after TTL seconds.
+USER_CLAIMS_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 60,
+    'BACKEND': 'default',
+    'BACKEND_TTL': 300,
+    'GENERATION_CHECK_INTERVAL': 2,
+}
+
+# Revoked jtis (rotation/logout) are kept in core.RevokedToken behind per-process Bloom filters.
+# SYNC_INTERVAL is how often (seconds) each process pulls revocations made by other processes;
+# each pull re-reads the last SYNC_OVERLAP seconds so rows that committed late are not missed.
+TOKEN_REVOCATION = {
+    'BUCKET_SECONDS': 3600,
+    'BUCKET_CAPACITY': 100000,
+    'ERROR_RATE': 0.001,
+    'SYNC_INTERVAL': 5,
+    'SYNC_OVERLAP': 60,
+}
+
+# Sliding-window limits on failed logins, kept in the shared CACHES alias so every worker counts
+# against the same limits. Redis (REDIS_URL) keeps incr() atomic; the database cache may undercount bursts.
+LOGIN_PROTECTION = {
+    'CACHE': 'default',
+    'WINDOW': 300,
+    'EMAIL_LIMIT': 10,
+    'IP_LIMIT': 50,
+}
+
+# Bounded pool for PBKDF2 work (login, user creation). Requests that find all
+# MAX_WORKERS + MAX_QUEUE slots taken get 503 with Retry-After: RETRY_AFTER.
+PASSWORD_HASHING_POOL = {
+    'MAX_WORKERS': 4,
+    'MAX_QUEUE': 32,
+    'RETRY_AFTER': 1,
+}
+
+# Fraction of requests whose auth spans are timed; aggregates are served at /api/auth/metrics/
+AUTH_INSTRUMENTATION = {
+    'SAMPLE_RATE': 0.01,
+    'LOG_SPANS': True,
+}
+
+# Public job board responses, keyed on query params and a version bumped by JobPosting writes.
+# CACHE must be a shared alias (see CACHES) so the version and stampede lock span all workers.
+JOB_BOARD_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUT': 300,
+    'LOCK_TIMEOUT': 10,
+    'LOCK_WAIT': 2,
+}
+
+# Background exports are written here by a small in-process pool (see exports.worker)
+EXPORTS = {
+    'DIRECTORY': BASE_DIR / 'var' / 'exports',
+    'WORKERS': 2,
+    'CHUNK_SIZE': 2000,
+}
+
+# Change history rows are queued after commit and written in batches by a background thread
+# (core.audit). A full queue falls back to writing in the request thread.
+CHANGE_HISTORY = {
+    'WRITE_BEHIND': True,
+    'FLUSH_INTERVAL_MS': 500,
+    'BATCH_SIZE': 200,
+    'MAX_QUEUE': 10000,
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.'
@@ -24,5 +24,7 @@ urlpatterns = [
     path('api/prf/', include('prf.urls')),
     path('api/job/', include('job.urls')),
     path('api/position/', include('position.urls')),
-    path('api/client/', include('client.urls'))
+    path('api/client/', include('client.urls')),
+    path('api/export/', include('exports.urls')),
+    path('api/import/', include('imports.urls'))
 ]
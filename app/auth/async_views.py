@@ -0,0 +1,113 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from auth.cache import user_claims_cache
+from auth.hashing import hashing_pool, PoolSaturated
+from auth.revocation import revocation_store
+from auth.throttling import login_guard
+from auth.views import MAX_LOGIN_ATTEMPTS, send_token
+from core.models import User
+
+# ASGI variants of auth.views.login/refresh_token. Hashing runs on the shared bounded
+# pool and is awaited, so the event loop keeps serving other requests meanwhile.
+
+
+def _detail(message, status_code, headers=None):
+    return JsonResponse({'detail': message}, status=status_code, headers=headers)
+
+
+def _unavailable(exc):
+    return _detail(exc.detail, exc.status_code, headers={'Retry-After': str(exc.wait)})
+
+
+@csrf_exempt
+@require_POST
+async def login(request):
+    try:
+        data = json.loads(request.body or b'{}')
+        email = data['email']
+        password = data['password']
+    except (ValueError, KeyError, TypeError):
+        return _detail('Email and password are required.', status.HTTP_400_BAD_REQUEST)
+    if not isinstance(email, str) or not email or not isinstance(password, str):
+        return _detail('Email and password are required.', status.HTTP_400_BAD_REQUEST)
+
+    ip = request.META.get('REMOTE_ADDR')
+
+    retry_after = await sync_to_async(login_guard.retry_after)(email, ip)
+    if retry_after:
+        return _detail('Too many login attempts. Please try again later.', status.HTTP_429_TOO_MANY_REQUESTS,
+                       headers={'Retry-After': str(retry_after)})
+
+    user = await User.objects.filter(email=email).afirst()
+    if user is None:
+        await sync_to_async(login_guard.register_failure)(email, ip)
+        return _detail('No User matches the given query.', status.HTTP_404_NOT_FOUND)
+
+    if user.attempt >= MAX_LOGIN_ATTEMPTS:
+        return _detail('Account Locked. Please ask administrator!', status.HTTP_403_FORBIDDEN)
+
+    if not user.is_active:
+        return _detail('User account is inactive.', status.HTTP_403_FORBIDDEN)
+
+    try:
+        valid = await hashing_pool.acheck_password(password, user.password)
+    except PoolSaturated as exc:
+        return _unavailable(exc)
+
+    if not valid:
+        await sync_to_async(login_guard.register_failure)(email, ip)
+        user.attempt = await sync_to_async(User.objects.increment_attempt)(user.id, MAX_LOGIN_ATTEMPTS)
+
+        if user.attempt >= MAX_LOGIN_ATTEMPTS:
+            # The shared cache backend (database or Redis) is sync-only
+            await sync_to_async(user_claims_cache.invalidate)(user.id)
+            return _detail('Account Locked. Please ask administrator!', status.HTTP_403_FORBIDDEN)
+
+        return _detail(f'Wrong password. Please try again. {MAX_LOGIN_ATTEMPTS - user.attempt} remaining attempt/s.',
+                       status.HTTP_400_BAD_REQUEST)
+
+    if user.attempt > 0:
+        await User.objects.filter(id=user.id).aupdate(attempt=0)
+        user.attempt = 0
+    await sync_to_async(login_guard.reset)(email)
+
+    return send_token(user, response_class=JsonResponse)
+
+
+@csrf_exempt
+@require_POST
+async def refresh_token(request):
+    ref_tok = request.COOKIES.get('refresh_token')
+    if not ref_tok:
+        return _detail('Authentication credentials were not provided.', status.HTTP_401_UNAUTHORIZED)
+
+    try:
+        refresh = RefreshToken(ref_tok)
+    except TokenError:
+        return _detail('Invalid refresh token', status.HTTP_401_UNAUTHORIZED)
+
+    if await sync_to_async(revocation_store.is_revoked)(refresh):
+        return _detail('Refresh token has been revoked', status.HTTP_401_UNAUTHORIZED)
+
+    user = await User.objects.filter(id=refresh.payload.get('user_id')).afirst()
+    if user is None:
+        return _detail('User not found', status.HTTP_401_UNAUTHORIZED)
+
+    if not user.is_active:
+        return _detail('User account is inactive', status.HTTP_401_UNAUTHORIZED)
+
+    if user.attempt >= MAX_LOGIN_ATTEMPTS:
+        return _detail('Account is locked', status.HTTP_401_UNAUTHORIZED)
+
+    if not await sync_to_async(revocation_store.revoke)(refresh):
+        return _detail('Refresh token has been revoked', status.HTTP_401_UNAUTHORIZED)
+
+    return send_token(user, response_class=JsonResponse)
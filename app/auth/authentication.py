@@ -1,8 +1,11 @@
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.conf import settings
 from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 
-from core.models import User
+from auth.cache import user_claims_cache, build_user
+from auth.instrumentation import span
+from auth.revocation import revocation_store
 
 
 class CookieJWTAuthentication(JWTAuthentication):
@@ -23,31 +26,37 @@ class CookieJWTAuthentication(JWTAuthentication):
         if raw_token is None:
             return None
 
-        validated_token = self.get_validated_token(raw_token)
-        user = self.get_user(validated_token)
+        with span(request, 'token_decode'):
+            validated_token = self.get_validated_token(raw_token)
+
+        with span(request, 'revocation_check'):
+            revoked = revocation_store.is_revoked(validated_token)
+        if revoked:
+            raise InvalidToken('Token has been revoked')
 
         try:
-            current_user = User.objects.get(id=user.id)
-            if not current_user.is_active or current_user.attempt >= 5:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        # Served from the claims cache; invalidated on User save/lock/deactivate
+        with span(request, 'user_lookup'):
+            claims = user_claims_cache.get(user_id)
+        if claims is None:
+            raise InvalidToken('User not found')
+
+        with span(request, 'claim_comparison'):
+            if not claims['is_active'] or claims['attempt'] >= 5:
                 raise InvalidToken('User account is inactive or locked')
 
             # Check if current role matches token role
-            token_role = validated_token.get('role')
-            token_department = validated_token.get('department')
-            token_business_unit = validated_token.get('business_unit')
-
-            print(f"Token Role: {token_role}, User Role: {current_user.role}")
-            print(f"Token Department: {token_department}, User Department: {current_user.department}")
-            print(f"Token Business Unit: {token_business_unit}, User Business Unit: {current_user.business_unit}")
-            if current_user.role != token_role:
+            if claims['role'] != validated_token.get('role'):
                 raise InvalidToken('User role has changed, please login again')
 
-            if current_user.department != token_department:
+            if claims['department'] != validated_token.get('department'):
                 raise InvalidToken('User department has changed, please login again')
 
-            if current_user.business_unit != token_business_unit:
+            if claims['business_unit'] != validated_token.get('business_unit'):
                 raise InvalidToken('User business unit has changed, please login again')
 
-            return current_user, validated_token
-        except User.DoesNotExist:
-            raise InvalidToken('User not found')
\ No newline at end of file
+        return build_user(claims), validated_token
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.models import User
+
+# Bump when CLAIM_FIELDS changes so shared-cache entries with the old shape are ignored
+CLAIMS_VERSION = 2
+CLAIM_FIELDS = ('id', 'is_active', 'attempt', 'role', 'department', 'business_unit', 'is_superuser', 'is_staff')
+
+
+class UserClaimsCache:
+    # With a shared backend a per-user generation kept there is checked at most every
+    # `check_interval` seconds per entry, so an invalidate() in one worker reaches the others
+    # within that interval while most requests touch neither the backend nor the database.
+    # Without one, entries are per process and a change elsewhere is only picked up when `ttl` expires.
+    def __init__(self, max_size=10000, ttl=60, backend=None, backend_ttl=300, check_interval=2):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = backend
+        self.backend_ttl = backend_ttl
+        self.check_interval = check_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, user_id, generation):
+        return f'user_claims:{user_id}:{generation}'
+
+    def _generation_key(self, user_id):
+        return f'user_claims_generation:{user_id}'
+
+    def _generation(self, user_id):
+        if self.backend is None:
+            return 0
+        key = self._generation_key(user_id)
+        generation = self.backend.get(key)
+        if generation is None:
+            # Seed from the clock so an evicted generation never matches an older local entry
+            self.backend.add(key, time.time_ns(), None)
+            generation = self.backend.get(key, 0)
+        return generation
+
+    # Local entry: (expires_at, generation, checked_until, claims)
+    def _get_entry(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry
+
+    def _set_local(self, user_id, generation, claims, expires_at=None):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[user_id] = (expires_at or now + self.ttl, generation, now + self.check_interval, claims)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, user_id):
+        entry = self._get_entry(user_id)
+        if entry is not None and entry[2] > time.monotonic():
+            return entry[3]
+
+        generation = self._generation(user_id)
+        if entry is not None and entry[1] == generation:
+            self._set_local(user_id, generation, entry[3], expires_at=entry[0])
+            return entry[3]
+
+        if self.backend is not None:
+            claims = self.backend.get(self._key(user_id, generation), version=CLAIMS_VERSION)
+            if claims is not None:
+                self._set_local(user_id, generation, claims)
+                return claims
+
+        claims = User.objects.filter(id=user_id).values(*CLAIM_FIELDS).first()
+        if claims is None:
+            return None
+
+        if self.backend is not None:
+            self.backend.set(self._key(user_id, generation), claims, self.backend_ttl, version=CLAIMS_VERSION)
+        self._set_local(user_id, generation, claims)
+        return claims
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+        if self.backend is None:
+            return
+        for user_id in user_ids:
+            try:
+                self.backend.incr(self._generation_key(user_id))
+            except ValueError:
+                self.backend.set(self._generation_key(user_id), time.time_ns(), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def build_user(claims):
+    # Only the cached columns are loaded; anything else a view touches is fetched lazily.
+    # from_db() expects the values in model field order, not claim order.
+    field_names = [field.attname for field in User._meta.concrete_fields if field.attname in claims]
+    return User.from_db('default', field_names, [claims[name] for name in field_names])
+
+
+def _build_cache():
+    config = getattr(settings, 'USER_CLAIMS_CACHE', {})
+    backend_alias = config.get('BACKEND')
+    return UserClaimsCache(
+        max_size=config.get('MAX_SIZE', 10000),
+        ttl=config.get('TTL', 60),
+        backend=caches[backend_alias] if backend_alias else None,
+        backend_ttl=config.get('BACKEND_TTL', 300),
+        check_interval=config.get('GENERATION_CHECK_INTERVAL', 2),
+    )
+
+
+user_claims_cache = _build_cache()
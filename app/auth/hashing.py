@@ -0,0 +1,66 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PoolSaturated(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Server is busy. Please try again shortly.'
+    default_code = 'service_unavailable'
+
+    def __init__(self, wait):
+        super().__init__()
+        # DRF's exception handler turns `wait` into a Retry-After header
+        self.wait = wait
+
+
+# PBKDF2 releases the GIL, so a small thread pool hashes in parallel while request
+# workers stay free. Submissions beyond MAX_WORKERS + MAX_QUEUE are refused.
+class HashingPool:
+    def __init__(self, max_workers=4, max_queue=32, retry_after=1):
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturated(self.retry_after)
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+    def run(self, fn, *args):
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def check_password(self, raw_password, encoded):
+        return self.run(check_password, raw_password, encoded)
+
+    async def acheck_password(self, raw_password, encoded):
+        return await self.run_async(check_password, raw_password, encoded)
+
+    def make_password(self, raw_password):
+        return self.run(make_password, raw_password)
+
+
+def _build_pool():
+    config = getattr(settings, 'PASSWORD_HASHING_POOL', {})
+    return HashingPool(
+        max_workers=config.get('MAX_WORKERS', 4),
+        max_queue=config.get('MAX_QUEUE', 32),
+        retry_after=config.get('RETRY_AFTER', 1),
+    )
+
+
+hashing_pool = _build_pool()
@@ -0,0 +1,95 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+
+_config = getattr(settings, 'AUTH_INSTRUMENTATION', {})
+SAMPLE_RATE = _config.get('SAMPLE_RATE', 0.01)
+LOG_SPANS = _config.get('LOG_SPANS', True)
+
+# Span lines go through a queue; a listener thread does the actual stream write
+logger = logging.getLogger('auth.instrumentation')
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_listener = QueueListener(_log_queue, logging.StreamHandler(), respect_handler_level=False)
+_listener.start()
+atexit.register(_listener.stop)
+
+_NOT_SAMPLED = object()
+
+
+class SpanStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: defaultdict(lambda: {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}))
+
+    def add(self, endpoint, name, elapsed_ms):
+        with self._lock:
+            stat = self._stats[endpoint][name]
+            stat['count'] += 1
+            stat['total_ms'] += elapsed_ms
+            stat['max_ms'] = max(stat['max_ms'], elapsed_ms)
+
+    def snapshot(self, reset=False):
+        with self._lock:
+            data = {
+                endpoint: {
+                    name: {
+                        'count': stat['count'],
+                        'avg_ms': round(stat['total_ms'] / stat['count'], 3),
+                        'max_ms': round(stat['max_ms'], 3),
+                    }
+                    for name, stat in spans.items()
+                }
+                for endpoint, spans in self._stats.items()
+            }
+            if reset:
+                self._stats.clear()
+        return data
+
+
+span_stats = SpanStats()
+
+
+def _endpoint(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is not None and match.route:
+        return f'{request.method} /{match.route}'
+    return f'{request.method} {request.path}'
+
+
+def _trace(request):
+    # One sampling decision per request, cached on the underlying HttpRequest
+    http_request = getattr(request, '_request', request)
+    trace = getattr(http_request, '_auth_trace', None)
+    if trace is None:
+        trace = _endpoint(request) if random.random() < SAMPLE_RATE else _NOT_SAMPLED
+        http_request._auth_trace = trace
+    return trace
+
+
+@contextmanager
+def span(request, name):
+    endpoint = _trace(request)
+    if endpoint is _NOT_SAMPLED:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        span_stats.add(endpoint, name, elapsed_ms)
+        if LOG_SPANS:
+            logger.info(json.dumps({'endpoint': endpoint, 'span': name, 'ms': round(elapsed_ms, 3)}))
@@ -1,9 +1,20 @@
 from rest_framework.permissions import BasePermission
 
-class IsSuperAdmin(BasePermission):
+from auth.instrumentation import span
+
+
+class InstrumentedPermission(BasePermission):
     def has_permission(self, request, view):
+        with span(request, f'permission.{type(self).__name__}'):
+            return self.check_permission(request, view)
+
+    def check_permission(self, request, view):
+        return True
+
+class IsSuperAdmin(InstrumentedPermission):
+    def check_permission(self, request, view):
         return request.user and request.user.is_superuser
 
-class IsHiringManager(BasePermission):
-    def has_permission(self, request, view):
-        return request.user and request.user.is_authenticated and request.user.role == 'hiring_manager'
\ No newline at end of file
+class IsHiringManager(InstrumentedPermission):
+    def check_permission(self, request, view):
+        return request.user and request.user.is_authenticated and request.user.role == 'hiring_manager'
@@ -0,0 +1,135 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone as dj_timezone
+
+from core.models import RevokedToken
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+# Revoked token ids live in RevokedToken; each process keeps one Bloom filter per
+# expiry bucket in front of it, so the common "not revoked" answer never touches
+# the database. Buckets are dropped once every token in them has expired.
+class RevocationStore:
+    def __init__(self, bucket_seconds=3600, bucket_capacity=100000, error_rate=0.001, sync_interval=5,
+                 sync_overlap=60):
+        self.bucket_seconds = bucket_seconds
+        self.bucket_capacity = bucket_capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self._buckets = {}
+        self._watermark = None
+        self._synced_at = None
+        self._lock = threading.Lock()
+
+    def _bucket_for(self, exp):
+        return int(exp) // self.bucket_seconds
+
+    def _add_local(self, jti, exp):
+        bucket = self._bucket_for(exp)
+        bloom = self._buckets.get(bucket)
+        if bloom is None:
+            bloom = self._buckets[bucket] = BloomFilter(self.bucket_capacity, self.error_rate)
+        bloom.add(jti)
+
+    def _sync(self):
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return
+
+        with self._lock:
+            if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+                return
+
+            current_bucket = self._bucket_for(time.time())
+            for bucket in [b for b in self._buckets if b < current_bucket]:
+                del self._buckets[bucket]
+
+            # Ids and revoked_at are assigned before commit, so rows can become visible out of
+            # order. Re-reading a trailing SYNC_OVERLAP window catches late commits; adding a
+            # jti twice to a Bloom filter is harmless.
+            rows = RevokedToken.objects.filter(expires_at__gt=dj_timezone.now())
+            if self._watermark is not None:
+                rows = rows.filter(revoked_at__gte=self._watermark - self.sync_overlap)
+            for jti, expires_at, revoked_at in rows.values_list('jti', 'expires_at', 'revoked_at').iterator(
+                    chunk_size=5000):
+                self._add_local(jti, expires_at.timestamp())
+                if self._watermark is None or revoked_at > self._watermark:
+                    self._watermark = revoked_at
+
+            self._synced_at = now
+
+    def is_revoked(self, token):
+        jti = token.payload.get('jti')
+        exp = token.payload.get('exp')
+        if jti is None or exp is None:
+            return True
+
+        self._sync()
+        bloom = self._buckets.get(self._bucket_for(exp))
+        if bloom is None or jti not in bloom:
+            return False
+
+        # Possible false positive, confirm against the table
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    # Returns False when the token had already been revoked
+    def revoke(self, token):
+        jti = token.payload.get('jti')
+        exp = token.payload.get('exp')
+        if jti is None or exp is None:
+            return False
+
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(
+                    jti=jti,
+                    user_id=token.payload.get('user_id'),
+                    expires_at=datetime.fromtimestamp(exp, tz=timezone.utc),
+                )
+        except IntegrityError:
+            return False
+        finally:
+            with self._lock:
+                self._add_local(jti, exp)
+
+        return True
+
+
+def _build_store():
+    config = getattr(settings, 'TOKEN_REVOCATION', {})
+    return RevocationStore(
+        bucket_seconds=config.get('BUCKET_SECONDS', 3600),
+        bucket_capacity=config.get('BUCKET_CAPACITY', 100000),
+        error_rate=config.get('ERROR_RATE', 0.001),
+        sync_interval=config.get('SYNC_INTERVAL', 5),
+        sync_overlap=config.get('SYNC_OVERLAP', 60),
+    )
+
+
+revocation_store = _build_store()
@@ -1,3 +1,227 @@
-from django.test import TestCase
+import asyncio
+import statistics
+import threading
+import time
+from datetime import timedelta
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.db import connection
+from django.test import AsyncClient, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from auth.cache import UserClaimsCache, build_user
+from auth.hashing import HashingPool, PoolSaturated
+from auth.revocation import RevocationStore
+from auth.views import MAX_LOGIN_ATTEMPTS
+from core.models import RevokedToken, User
+
+
+def make_user(email='user@example.com', **extra_fields):
+    extra_fields.setdefault('first_name', 'Test')
+    extra_fields.setdefault('last_name', 'User')
+    return User.objects.create_user(email, 'password', **extra_fields)
+
+
+class UserClaimsCacheTests(TestCase):
+    def setUp(self):
+        # The configured shared alias (the database cache here, Redis in production)
+        self.backend = caches['default']
+        self.backend.clear()
+        self.user = make_user(role='manager')
+
+    def test_invalidate_in_one_worker_reaches_the_others(self):
+        # Two caches over one backend stand in for two worker processes
+        worker_a = UserClaimsCache(backend=self.backend, check_interval=0.05)
+        worker_b = UserClaimsCache(backend=self.backend, check_interval=0.05)
+        self.assertEqual(worker_a.get(self.user.id)['role'], 'manager')
+        self.assertEqual(worker_b.get(self.user.id)['role'], 'manager')
+
+        User.objects.filter(id=self.user.id).update(role='hiring_manager', attempt=5)
+        worker_a.invalidate(self.user.id)
+        self.assertEqual(worker_a.get(self.user.id)['role'], 'hiring_manager')
+
+        # worker_b notices at its next generation check
+        time.sleep(0.06)
+        claims = worker_b.get(self.user.id)
+        self.assertEqual(claims['role'], 'hiring_manager')
+        self.assertEqual(claims['attempt'], 5)
+
+    def test_local_hit_does_not_query_the_database(self):
+        cache = UserClaimsCache(backend=self.backend)
+        cache.get(self.user.id)
+        with self.assertNumQueries(0):
+            for _ in range(100):
+                cache.get(self.user.id)
+
+    def test_generation_checks_are_rate_limited(self):
+        def measure(cache, requests=200):
+            cache.get(self.user.id)
+            samples = []
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(requests):
+                    started = time.perf_counter()
+                    cache.get(self.user.id)
+                    samples.append(time.perf_counter() - started)
+            percentiles = statistics.quantiles(samples, n=100)
+            return len(queries) / requests, percentiles[49], percentiles[98]
+
+        # Before: the generation was read from the shared cache on every request
+        before_queries, before_p50, before_p99 = measure(UserClaimsCache(backend=self.backend, check_interval=0))
+        after_queries, after_p50, after_p99 = measure(UserClaimsCache(backend=self.backend, check_interval=60))
+
+        self.assertEqual(before_queries, 1)
+        self.assertEqual(after_queries, 0)
+        self.assertLess(after_p50, before_p50)
+        self.assertLess(after_p99, before_p99)
+
+    def test_built_user_answers_permission_checks_without_queries(self):
+        User.objects.filter(id=self.user.id).update(is_superuser=True, is_staff=True)
+        claims = UserClaimsCache().get(self.user.id)
+        with self.assertNumQueries(0):
+            user = build_user(claims)
+            self.assertTrue(user.is_superuser)
+            self.assertTrue(user.is_staff)
+            self.assertEqual(user.role, 'manager')
+
+
+class FakeToken:
+    def __init__(self, jti, exp):
+        self.payload = {'jti': jti, 'exp': exp}
+
+
+class RevocationStoreTests(TestCase):
+    def test_revocation_committed_out_of_order_is_still_seen(self):
+        expires_at = timezone.now() + timedelta(hours=1)
+        store = RevocationStore(sync_interval=0)
+
+        RevokedToken.objects.create(id=500, jti='newer', expires_at=expires_at)
+        self.assertTrue(store.is_revoked(FakeToken('newer', expires_at.timestamp())))
+
+        # A slower transaction took a lower id and an earlier timestamp but commits only now
+        RevokedToken.objects.create(id=100, jti='late', expires_at=expires_at)
+        RevokedToken.objects.filter(jti='late').update(revoked_at=timezone.now() - timedelta(seconds=10))
+
+        self.assertTrue(store.is_revoked(FakeToken('late', expires_at.timestamp())))
+        self.assertFalse(store.is_revoked(FakeToken('never-revoked', expires_at.timestamp())))
+
+
+class LoginConcurrencyTests(TransactionTestCase):
+    PARALLEL_LOGINS = 20
+
+    def setUp(self):
+        caches['default'].clear()
+        self.user = make_user('locked@example.com')
+
+    def test_parallel_failed_logins_lock_the_account_exactly_once(self):
+        results = []
+        barrier = threading.Barrier(self.PARALLEL_LOGINS)
+
+        def attempt(index):
+            client = APIClient(REMOTE_ADDR=f'10.0.0.{index}')
+            try:
+                barrier.wait()
+                response = client.post('/api/auth/login/', {'email': self.user.email, 'password': 'wrong'},
+                                       format='json')
+                results.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=attempt, args=(index,)) for index in range(self.PARALLEL_LOGINS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.attempt, MAX_LOGIN_ATTEMPTS)
+        # Each of the first MAX_LOGIN_ATTEMPTS - 1 failures gets its own "remaining" answer; the rest
+        # are locked (403) or throttled (429). Nothing is lost and nothing logs in.
+        self.assertEqual(results.count(400), MAX_LOGIN_ATTEMPTS - 1)
+        self.assertEqual(len(results), self.PARALLEL_LOGINS)
+        self.assertTrue(set(results) <= {400, 403, 429}, results)
+
+
+class HashingPoolTests(TestCase):
+    def test_full_pool_refuses_with_retry_after(self):
+        pool = HashingPool(max_workers=1, max_queue=1, retry_after=3)
+        release = threading.Event()
+        running = [pool.submit(release.wait), pool.submit(release.wait)]
+        try:
+            with self.assertRaises(PoolSaturated) as ctx:
+                pool.submit(release.wait)
+            self.assertEqual(ctx.exception.wait, 3)
+        finally:
+            release.set()
+            for future in running:
+                future.result()
+
+    def test_login_rejects_non_string_email(self):
+        for body in ({'email': ['a@example.com'], 'password': 'x'}, {'email': 1, 'password': 'x'}, {}):
+            response = APIClient().post('/api/auth/login/', body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+            response = self.client.post('/api/auth/async/login/', body, content_type='application/json')
+            self.assertEqual(response.status_code, 400, body)
+
+    def test_created_user_keeps_set_password_bookkeeping(self):
+        user = make_user('hash@example.com')
+        self.assertTrue(user.check_password('password'))
+        self.assertIsNone(user._password)  # Cleared by save(), as after set_password()
+
+
+class AsyncLoginLockoutTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = make_user('async-locked@example.com')
+
+    async def test_wrong_passwords_lock_the_account_and_reach_other_workers(self):
+        other_worker = UserClaimsCache(backend=caches['default'], check_interval=0)
+        self.assertEqual((await sync_to_async(other_worker.get)(self.user.id))['attempt'], 0)
+
+        client = AsyncClient()
+        statuses = []
+        for _ in range(MAX_LOGIN_ATTEMPTS):
+            response = await client.post('/api/auth/async/login/', {'email': self.user.email, 'password': 'wrong'},
+                                         content_type='application/json')
+            statuses.append(response.status_code)
+
+        self.assertEqual(statuses, [400] * (MAX_LOGIN_ATTEMPTS - 1) + [403])
+        self.assertEqual(response.json()['detail'], 'Account Locked. Please ask administrator!')
+        claims = await sync_to_async(other_worker.get)(self.user.id)
+        self.assertEqual(claims['attempt'], MAX_LOGIN_ATTEMPTS)
+
+        response = await client.post('/api/auth/async/login/', {'email': self.user.email, 'password': 'password'},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+
+class AsyncLoginStormTests(TransactionTestCase):
+    LOGINS = 40
+    PROBES = 20
+
+    def setUp(self):
+        caches['default'].clear()
+        self.users = [make_user(f'storm{index}@example.com') for index in range(self.LOGINS)]
+
+    async def test_login_storm_is_answered_or_turned_away_cleanly(self):
+        client = AsyncClient()
+
+        async def login(user):
+            return await AsyncClient(REMOTE_ADDR=f'10.1.{user.id % 250}.1').post(
+                '/api/auth/async/login/', {'email': user.email, 'password': 'password'},
+                content_type='application/json')
+
+        logins, probes = await asyncio.gather(
+            asyncio.gather(*[login(user) for user in self.users]),
+            asyncio.gather(*[client.get('/api/job/') for _ in range(self.PROBES)]),
+        )
+
+        for response in logins:
+            # Either logged in or turned away by back-pressure, never an error or a hang
+            self.assertIn(response.status_code, (200, 503))
+            if response.status_code == 503:
+                self.assertIn('Retry-After', response.headers)
+        self.assertTrue(any(response.status_code == 200 for response in logins))
+        self.assertTrue(all(response.status_code == 200 for response in probes))
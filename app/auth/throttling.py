@@ -0,0 +1,83 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class SlidingWindowLimiter:
+    # Sliding-window counter: the previous fixed window is weighted by how much of it
+    # still overlaps the sliding window. Two cache keys per subject, updated with incr().
+    def __init__(self, cache, prefix, limit, window):
+        self.cache = cache
+        self.prefix = prefix
+        self.limit = limit
+        self.window = window
+
+    def _key(self, subject, index):
+        return f'{self.prefix}:{subject}:{index}'
+
+    def _state(self, subject):
+        now = time.time()
+        index = int(now // self.window)
+        current_key = self._key(subject, index)
+        previous_key = self._key(subject, index - 1)
+        counts = self.cache.get_many([current_key, previous_key])
+        elapsed = (now % self.window) / self.window
+        estimate = counts.get(current_key, 0) + counts.get(previous_key, 0) * (1 - elapsed)
+        return estimate, now, index
+
+    # Returns the number of seconds to wait, or 0 when the subject is under the limit
+    def retry_after(self, subject):
+        estimate, now, index = self._state(subject)
+        if estimate < self.limit:
+            return 0
+        return max(1, math.ceil((index + 1) * self.window - now))
+
+    def hit(self, subject):
+        key = self._key(subject, int(time.time() // self.window))
+        # add() is a no-op when the key exists, so concurrent first hits are not lost
+        self.cache.add(key, 0, timeout=self.window * 2)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, timeout=self.window * 2)
+
+    def reset(self, subject):
+        index = int(time.time() // self.window)
+        self.cache.delete_many([self._key(subject, index), self._key(subject, index - 1)])
+
+
+class LoginGuard:
+    def __init__(self, cache, window, email_limit, ip_limit):
+        self.email_limiter = SlidingWindowLimiter(cache, 'login:email', email_limit, window)
+        self.ip_limiter = SlidingWindowLimiter(cache, 'login:ip', ip_limit, window)
+
+    def retry_after(self, email, ip):
+        return max(
+            self.email_limiter.retry_after(email.lower()) if email else 0,
+            self.ip_limiter.retry_after(ip) if ip else 0,
+        )
+
+    def register_failure(self, email, ip):
+        if email:
+            self.email_limiter.hit(email.lower())
+        if ip:
+            self.ip_limiter.hit(ip)
+
+    def reset(self, email):
+        if email:
+            self.email_limiter.reset(email.lower())
+
+
+def _build_guard():
+    config = getattr(settings, 'LOGIN_PROTECTION', {})
+    return LoginGuard(
+        cache=caches[config.get('CACHE', 'default')],
+        window=config.get('WINDOW', 300),
+        email_limit=config.get('EMAIL_LIMIT', 10),
+        ip_limit=config.get('IP_LIMIT', 50),
+    )
+
+
+login_guard = _build_guard()
@@ -1,9 +1,12 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     path('login/', views.login, name='login'),
     path('logout/', views.logout, name='logout'),
     path('token/refresh/', views.refresh_token, name='refresh_token'),
+    path('async/login/', async_views.login, name='async_login'),
+    path('async/token/refresh/', async_views.refresh_token, name='async_refresh_token'),
+    path('metrics/', views.auth_metrics, name='auth_metrics'),
     path('test/', views.test_protected_view, name='protected_route'),
 ]
\ No newline at end of file
@@ -1,33 +1,43 @@
+from django.http import Http404
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 
 from app import settings
 from auth.authentication import CookieJWTAuthentication
+from auth.cache import user_claims_cache
+from auth.hashing import hashing_pool
+from auth.instrumentation import span_stats
+from auth.permissions import IsSuperAdmin
+from auth.revocation import revocation_store
+from auth.throttling import login_guard
 from user.serializers import UserSerializer
 from core.models import User
 
 REFRESH_TOKEN_LIFETIME= settings.SIMPLE_JWT.get('REFRESH_TOKEN_LIFETIME')
 ACCESS_TOKEN_LIFETIME= settings.SIMPLE_JWT.get('ACCESS_TOKEN_LIFETIME')
 
+MAX_LOGIN_ATTEMPTS = 5
+
 def check_account_locked(user):
-    if user.attempt >= 5:
+    if user.attempt >= MAX_LOGIN_ATTEMPTS:
         return Response({
             'detail': 'Account Locked. Please ask administrator!'
         }, status=status.HTTP_403_FORBIDDEN)
     return None
 
-def send_token(user):
+def send_token(user, response_class=Response):
     refresh = RefreshToken.for_user(user)
     access_token = refresh.access_token
     access_token['role'] = user.role
     access_token['department'] = user.department
     access_token['business_unit'] = user.business_unit
 
-    customRes = Response({
+    customRes = response_class({
         'detail': 'Login successful',
         'user': UserSerializer(user, many=False).data,
         'access': str(access_token)
@@ -55,30 +65,53 @@ def send_token(user):
 # Create your views here.
 @api_view(['POST'])
 def login(request):
-    user = get_object_or_404(User, email=request.data['email'])
+    email = request.data.get('email')
+    password = request.data.get('password')
+    if not isinstance(email, str) or not email or not isinstance(password, str):
+        return Response({
+            'detail': 'Email and password are required.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    ip = request.META.get('REMOTE_ADDR')
 
-    if check_account_locked(user):
-        return check_account_locked(user)
+    # Reject bursts before spending a database read and a PBKDF2 round on them
+    retry_after = login_guard.retry_after(email, ip)
+    if retry_after:
+        return Response({
+            'detail': 'Too many login attempts. Please try again later.'
+        }, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': str(retry_after)})
+
+    try:
+        user = get_object_or_404(User, email=email)
+    except Http404:
+        login_guard.register_failure(email, ip)
+        raise
+
+    locked = check_account_locked(user)
+    if locked:
+        return locked
 
     if not user.is_active:
         return Response({
             'detail': 'User account is inactive.'
         }, status=status.HTTP_403_FORBIDDEN)
 
-    if not user.check_password(request.data['password']):
-        user.attempt += 1
-        user.save()
+    if not hashing_pool.check_password(password, user.password):
+        login_guard.register_failure(email, ip)
+        user.attempt = User.objects.increment_attempt(user.id, MAX_LOGIN_ATTEMPTS)
 
-        if check_account_locked(user):
-            return check_account_locked(user)
+        locked = check_account_locked(user)
+        if locked:
+            user_claims_cache.invalidate(user.id)
+            return locked
 
         return Response({
-            'detail': f'Wrong password. Please try again. {5 - user.attempt} remaining attempt/s.'
+            'detail': f'Wrong password. Please try again. {MAX_LOGIN_ATTEMPTS - user.attempt} remaining attempt/s.'
         }, status=status.HTTP_400_BAD_REQUEST)
 
     if user.attempt > 0:
+        User.objects.filter(id=user.id).update(attempt=0)
         user.attempt = 0
-        user.save()
+    login_guard.reset(email)
 
     return send_token(user)
 
@@ -91,6 +124,15 @@ def logout(request):
     if not access_token and not ref_token:
         return Response({}, status=status.HTTP_204_NO_CONTENT)
 
+    for token_class, raw_token in ((AccessToken, access_token), (RefreshToken, ref_token)):
+        if not raw_token:
+            continue
+        try:
+            revocation_store.revoke(token_class(raw_token))
+        except TokenError:
+            # Already expired or malformed, nothing left to revoke
+            pass
+
     response = Response({"message": "Logout successful"}, status=status.HTTP_204_NO_CONTENT)
     response.set_cookie('access_token', '', max_age=0,
                         httponly=True, secure=False, samesite="Strict")
@@ -110,6 +152,11 @@ def refresh_token(request):
 
     try:
         refresh = RefreshToken(ref_tok)
+        if revocation_store.is_revoked(refresh):
+            return Response({
+                'detail': 'Refresh token has been revoked'
+            }, status=status.HTTP_401_UNAUTHORIZED)
+
         user_id = refresh.payload.get('user_id')
 
         try:
@@ -129,6 +176,12 @@ def refresh_token(request):
                 'detail': 'Account is locked'
             }, status=status.HTTP_401_UNAUTHORIZED)
 
+        # Rotation: the presented token is single-use. A concurrent replay loses the insert race.
+        if not revocation_store.revoke(refresh):
+            return Response({
+                'detail': 'Refresh token has been revoked'
+            }, status=status.HTTP_401_UNAUTHORIZED)
+
         return send_token(user)
     except Exception as e:
         return Response({
@@ -141,4 +194,10 @@ def refresh_token(request):
 def test_protected_view(request):
     if request.user.role != "hiring_manager":
         return Response({"message": "You do not have permission to access this view"}, status=status.HTTP_403_FORBIDDEN)
-    return Response({"message": "This is a protected view"}, status=status.HTTP_200_OK)
\ No newline at end of file
+    return Response({"message": "This is a protected view"}, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsSuperAdmin])
+def auth_metrics(request):
+    reset = request.query_params.get('reset', 'false').lower() == 'true'
+    return Response(span_stats.snapshot(reset=reset), status=status.HTTP_200_OK)
@@ -0,0 +1,60 @@
+from datetime import datetime, time
+
+from django.db.models import Value
+from django.db.models.functions import Concat, NullIf
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from core.models import Client
+
+
+def _parse_moment(name, value):
+    error = ValidationError({name: ['Expected an ISO 8601 date or datetime.']})
+    # Well-formed but impossible values such as 2026-02-30 raise ValueError instead of returning None
+    try:
+        moment = parse_datetime(value)
+        day = parse_date(value) if moment is None else None
+    except ValueError:
+        raise error
+    if moment is None:
+        if day is None:
+            raise error
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+# ?active=true|false|all (default true), ?posted_by=<user id>, ?created_after= / ?created_before=
+def filter_clients(params):
+    qs = Client.objects.all()
+
+    active = params.get('active', 'true').lower()
+    if active not in ('true', 'false', 'all'):
+        raise ValidationError({'active': ['Expected true, false or all.']})
+    if active != 'all':
+        qs = qs.filter(active=active == 'true')
+
+    posted_by = params.get('posted_by')
+    if posted_by:
+        try:
+            qs = qs.filter(posted_by_id=int(posted_by))
+        except ValueError:
+            raise ValidationError({'posted_by': ['Expected a user id.']})
+
+    created_after = params.get('created_after')
+    if created_after:
+        qs = qs.filter(created_at__gte=_parse_moment('created_after', created_after))
+    created_before = params.get('created_before')
+    if created_before:
+        qs = qs.filter(created_at__lt=_parse_moment('created_before', created_before))
+
+    return with_posted_by_name(qs)
+
+
+# The poster's display name via LEFT JOIN in the same query (NULL when posted_by is NULL)
+def with_posted_by_name(queryset):
+    return queryset.annotate(posted_by_name=NullIf(
+        Concat('posted_by__first_name', Value(' '), 'posted_by__last_name'), Value(' ')
+    ))
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from core.models import Client
+from core.models import Client, Position, PipelineStep, ApplicationForm
+from job.serializers import FIELD_PRESETS, JobPostingSerializer
 
 class ClientSerializer(serializers.ModelSerializer):
     posted_by = serializers.SerializerMethodField(read_only=True)
@@ -9,4 +10,44 @@ class ClientSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def get_posted_by(self, obj):
-        return f"{obj.posted_by.first_name} {obj.posted_by.last_name}" if obj.posted_by else None
\ No newline at end of file
+        # Annotated by client.filters.with_posted_by_name on list reads; falls back for single objects
+        if hasattr(obj, 'posted_by_name'):
+            return obj.posted_by_name
+        return f"{obj.posted_by.first_name} {obj.posted_by.last_name}" if obj.posted_by else None
+
+
+# Read-only tree for GET /api/client/<pk>/tree/; branches are dropped unless named in ?expand=
+class PipelineStepReadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PipelineStep
+        fields = ['id', 'process_type', 'process_title', 'description', 'stage', 'order']
+
+
+class ApplicationFormReadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ApplicationForm
+        exclude = ['position']
+
+
+class PositionTreeSerializer(serializers.ModelSerializer):
+    job_posting = JobPostingSerializer(read_only=True, allow_null=True, fields=FIELD_PRESETS['summary'])
+    pipeline = PipelineStepReadSerializer(many=True, read_only=True)
+    application_form = ApplicationFormReadSerializer(read_only=True, allow_null=True)
+
+    class Meta:
+        model = Position
+        fields = ['id', 'education_level', 'experience_level', 'job_posting', 'pipeline', 'application_form']
+
+
+class ClientTreeSerializer(ClientSerializer):
+    positions = PositionTreeSerializer(many=True, read_only=True)
+
+    def __init__(self, *args, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'positions' not in expand:
+            self.fields.pop('positions')
+            return
+        position_fields = self.fields['positions'].child.fields
+        for name in ('job_posting', 'pipeline', 'application_form'):
+            if name not in expand:
+                position_fields.pop(name)
@@ -1,3 +1,110 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core.models import Client, Position, PipelineStep, ApplicationForm, JobPosting
+from job.tests import job_posting_values, make_hiring_manager
+
+
+def make_clients(count, start=0, **fields):
+    return Client.objects.bulk_create([
+        Client(name=f'Client {index}', email='client@example.com', contact_number='09171234567', **fields)
+        for index in range(start, start + count)
+    ])
+
+
+class ClientListTests(TestCase):
+    def setUp(self):
+        self.user = make_hiring_manager()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries]
+
+    def test_page_cost_does_not_grow_with_the_table(self):
+        created = 0
+        for total in (10, 10000):
+            make_clients(total - created, start=created, posted_by=self.user)
+            created = total
+
+            response, sql = self._queries('/api/client/?page_size=50')
+            self.assertEqual(len(response.data['results']), min(total, 50))
+            self.assertEqual(response.data['results'][0]['posted_by'], 'Hiring Manager')
+            # One keyset query with the poster's name joined in: no COUNT, no OFFSET, no per-row lookups
+            self.assertEqual(len(sql), 1, sql)
+            self.assertNotIn('COUNT(', sql[0].upper())
+            self.assertNotIn('OFFSET', sql[0].upper())
+
+            response, sql = self._queries(f'/api/client/?page_size=50&posted_by={self.user.id}&active=all')
+            self.assertEqual(len(sql), 1, sql)
+
+    def test_unknown_active_value_is_a_400(self):
+        for value in ('yes', '1', 'maybe'):
+            response = self.client.get(f'/api/client/?active={value}')
+            self.assertEqual(response.status_code, 400, value)
+            self.assertIn('active', response.data)
+        self.assertEqual(self.client.get('/api/client/?active=FALSE').status_code, 200)
+
+    def test_invalid_created_dates_are_a_400(self):
+        for value in ('2026-02-30', '2026-13-01', '2026-01-01T25:00:00', 'yesterday'):
+            for name in ('created_after', 'created_before'):
+                response = self.client.get(f'/api/client/?{name}={value}')
+                self.assertEqual(response.status_code, 400, (name, value))
+                self.assertIn(name, response.data)
+        response = self.client.get('/api/client/?created_after=2026-02-28&created_before=2026-03-01T00:00:00Z')
+        self.assertEqual(response.status_code, 200)
+
+
+class ClientTreeTests(TestCase):
+    POSITIONS = 200
+    STEPS = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_hiring_manager()
+        cls.tree_client = make_clients(1, posted_by=cls.user)[0]
+        job_postings = JobPosting.objects.bulk_create([
+            JobPosting(**job_posting_values(job_title=f'Position {index}', posted_by=cls.user))
+            for index in range(cls.POSITIONS)
+        ])
+        positions = Position.objects.bulk_create([
+            Position(client=cls.tree_client, job_posting=job_posting, education_level='bachelor', experience_level='mid')
+            for job_posting in job_postings
+        ])
+        ApplicationForm.objects.bulk_create([ApplicationForm(position=position) for position in positions])
+        PipelineStep.objects.bulk_create([
+            PipelineStep(position=position, process_type='initial_interview', process_title=f'Step {step}',
+                         stage=step % 4 + 1, order=step)
+            for position in positions for step in range(cls.STEPS)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_full_tree_is_three_queries(self):
+        url = f'/api/client/{self.tree_client.id}/tree/?expand=all'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        # The client, its positions with job posting and form joined in, and one prefetch of every step
+        self.assertEqual(len(queries), 3, [query['sql'] for query in queries])
+        positions = response.data['positions']
+        self.assertEqual(len(positions), self.POSITIONS)
+        self.assertEqual(sum(len(position['pipeline']) for position in positions), self.POSITIONS * self.STEPS)
+        self.assertIsNotNone(positions[0]['job_posting'])
+        self.assertIsNotNone(positions[0]['application_form'])
+
+    def test_partial_expansion_skips_the_unrequested_queries(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/client/{self.tree_client.id}/tree/')
+        self.assertNotIn('positions', response.data)
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/client/{self.tree_client.id}/tree/?expand=job_posting')
+        self.assertNotIn('pipeline', response.data['positions'][0])
@@ -1,8 +1,11 @@
 from django.urls import path
 
-from client.views import ClientListCreateView, ClientDetailView
+from client.views import ClientListCreateView, ClientDetailView, ClientTreeView
+from core.views import ChangeHistoryView
 
 urlpatterns = [
     path('', ClientListCreateView.as_view(), name='client-list'),
     path('<int:pk>/', ClientDetailView.as_view(), name='client-detail'),
+    path('<int:pk>/tree/', ClientTreeView.as_view(), name='client-tree'),
+    path('<int:pk>/history/', ChangeHistoryView.as_view(object_type='client'), name='client-history'),
 ]
\ No newline at end of file
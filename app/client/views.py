@@ -1,17 +1,24 @@
+from django.db.models import Prefetch
 from rest_framework import status
-from rest_framework.generics import RetrieveUpdateDestroyAPIView, ListAPIView, CreateAPIView, ListCreateAPIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import RetrieveUpdateDestroyAPIView, RetrieveAPIView, ListAPIView, CreateAPIView, ListCreateAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from auth.permissions import IsHiringManager
-from client.serializers import ClientSerializer
-from core.models import Client
+from client.filters import filter_clients, with_posted_by_name
+from client.serializers import ClientSerializer, ClientTreeSerializer
+from core.audit import diff, record_change
+from core.models import Client, Position, PipelineStep
+from core.pagination import KeysetPagination
 
 # Create your views here.
 class ClientListCreateView(ListCreateAPIView):
-    queryset = Client.objects.filter(active=True)
     serializer_class = ClientSerializer
-    pagination_class = None # To do: Add pagination later
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return filter_clients(self.request.query_params)
 
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -26,16 +33,69 @@ class ClientDetailView(RetrieveUpdateDestroyAPIView):
     serializer_class = ClientSerializer
     lookup_field = 'pk'
 
-    # To do: When updating a client make sure to record an update history showing who made the change.
-    # To do: When deleting a client only soft delete instead of permanently removing it
-
     def get_permissions(self):
         if self.request.method == 'GET':
             return [IsAuthenticated()]
         return [IsHiringManager()]
 
+    def perform_update(self, serializer):
+        history = diff(serializer.instance, serializer.validated_data)
+        serializer.save()
+        record_change('client', serializer.instance.pk, history, self.request.user)
+
+    # Soft delete: the row stays and drops out of the default (active) list
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        instance.is_active = False
-        instance.save()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        history = diff(instance, {'active': False})
+        instance.active = False
+        instance.save(update_fields=['active', 'updated_at'])
+        record_change('client', instance.pk, history, request.user, action='delete')
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+EXPAND_CHOICES = ('positions', 'job_posting', 'pipeline', 'application_form')
+
+
+# ?expand=positions,job_posting,pipeline,application_form (or all). Any expansion costs a fixed
+# number of queries: the client, its positions with job_posting/application_form joined in, and
+# one prefetch for every pipeline step, regardless of how many positions the client has.
+class ClientTreeView(RetrieveAPIView):
+    serializer_class = ClientTreeSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_field = 'pk'
+
+    def get_expand(self):
+        if not hasattr(self, '_expand'):
+            raw = self.request.query_params.get('expand', '')
+            names = {name.strip() for name in raw.split(',') if name.strip()}
+            if 'all' in names:
+                names = set(EXPAND_CHOICES)
+            unknown = names - set(EXPAND_CHOICES)
+            if unknown:
+                raise ValidationError({'expand': f'Unknown value(s): {", ".join(sorted(unknown))}.'})
+            if names:
+                # Anything below a position implies the positions themselves
+                names.add('positions')
+            self._expand = names
+        return self._expand
+
+    def get_queryset(self):
+        queryset = with_posted_by_name(Client.objects.all())
+        expand = self.get_expand()
+        if 'positions' not in expand:
+            return queryset
+
+        positions = Position.objects.order_by('id')
+        joined = [name for name in ('job_posting', 'application_form') if name in expand]
+        if joined:
+            positions = positions.select_related(*joined)
+        if 'job_posting' in expand:
+            positions = positions.defer('job_posting__search_vector')
+        if 'pipeline' in expand:
+            positions = positions.prefetch_related(
+                Prefetch('pipeline', queryset=PipelineStep.objects.order_by('stage', 'order'))
+            )
+        return queryset.prefetch_related(Prefetch('positions', queryset=positions))
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('expand', self.get_expand())
+        return super().get_serializer(*args, **kwargs)
@@ -1,9 +1,12 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.forms import UserChangeForm, UserCreationForm
 from django.utils.translation import gettext_lazy as _
+
+from auth.cache import user_claims_cache
+from auth.throttling import login_guard
 from core.models import User, PRF, Position, Client, ApplicationForm, PipelineStep, JobPosting, AssessmentType, \
-    HardwareRequirement, SoftwareRequirement
+    HardwareRequirement, SoftwareRequirement, PRFApproval
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -28,6 +31,7 @@ class UserAdmin(BaseUserAdmin):
     search_fields = ('email', 'first_name', 'last_name', 'role')
     list_filter = ('role', 'is_active', 'is_staff')
     ordering = ('email',)
+    actions = ['unlock_accounts']
 
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
@@ -70,6 +74,16 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+    @admin.action(description=_('Unlock selected accounts'))
+    def unlock_accounts(self, request, queryset):
+        locked = list(queryset.filter(attempt__gt=0).values_list('id', 'email'))
+        if locked:
+            User.objects.filter(id__in=[user_id for user_id, _email in locked]).update(attempt=0)
+            user_claims_cache.invalidate(*[user_id for user_id, _email in locked])
+            for _user_id, email in locked:
+                login_guard.reset(email)
+        self.message_user(request, f'{len(locked)} account(s) unlocked.', messages.SUCCESS)
+
 @admin.register(JobPosting)
 class JobPostingAdmin(admin.ModelAdmin):
     list_display = ('id', 'job_title', 'department_name', 'working_site', 'status', 'target_start_date', 'reason_for_posting', 'active')
@@ -101,6 +115,12 @@ class PRFAdmin(admin.ModelAdmin):
     # get_reason_for_posting.short_description = 'Reason for Posting'
     # get_reason_for_posting.admin_order_field = 'job_posting__reason_for_posting'
 
+@admin.register(PRFApproval)
+class PRFApprovalAdmin(admin.ModelAdmin):
+    list_display = ('prf', 'manager', 'decision', 'updated_at')
+    list_filter = ('decision',)
+    ordering = ('-updated_at',)
+
 @admin.register(AssessmentType)
 class AssessmentTypeAdmin(admin.ModelAdmin):
     list_display = ('name', 'prfs')
@@ -0,0 +1,150 @@
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from core.models import ChangeHistory
+
+logger = logging.getLogger(__name__)
+
+_config = getattr(settings, 'CHANGE_HISTORY', {})
+WRITE_BEHIND = _config.get('WRITE_BEHIND', True)
+FLUSH_INTERVAL = _config.get('FLUSH_INTERVAL_MS', 500) / 1000
+BATCH_SIZE = _config.get('BATCH_SIZE', 200)
+MAX_QUEUE = _config.get('MAX_QUEUE', 10000)
+
+
+def _plain(value):
+    if isinstance(value, Model):
+        return value.pk
+    if isinstance(value, (list, tuple, set)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _jsonable(value):
+    return json.loads(json.dumps(_plain(value), cls=DjangoJSONEncoder))
+
+
+# {field: [old, new]} for every value in `data` that differs from `instance`.
+# Call it before the change is applied; related objects are stored by primary key.
+def diff(instance, data):
+    changes = {}
+    for field, new in data.items():
+        old = getattr(instance, field)
+        if _plain(old) != _plain(new):
+            changes[field] = [_jsonable(old), _jsonable(new)]
+    return changes
+
+
+# Buffers history rows in a bounded queue; a daemon thread writes them with bulk_create
+# every FLUSH_INTERVAL or BATCH_SIZE rows, whichever comes first
+class ChangeWriter:
+    def __init__(self, flush_interval, batch_size, max_queue):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def put(self, entry):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Back-pressure instead of loss: the caller pays for this one write
+            self._write([entry])
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if (self._thread is None or not self._thread.is_alive()) and not self._stopping.is_set():
+                self._thread = threading.Thread(target=self._run, name='change-history-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stopping.is_set():
+                batch = self._collect()
+                if batch:
+                    close_old_connections()
+                    self._write(batch)
+        finally:
+            connections.close_all()
+
+    def _collect(self):
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, entries):
+        try:
+            ChangeHistory.objects.bulk_create([ChangeHistory(**entry) for entry in entries])
+        except Exception:
+            logger.exception('Failed to write %d change history row(s)', len(entries))
+
+    # Writes whatever is queued in the calling thread
+    def flush(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) == self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+
+change_writer = ChangeWriter(FLUSH_INTERVAL, BATCH_SIZE, MAX_QUEUE)
+# Graceful shutdown (SIGTERM to a worker, end of a management command) drains the queue
+atexit.register(change_writer.stop)
+
+
+# Queued only once the surrounding transaction commits, so rolled-back edits leave no history
+def record_change(object_type, object_id, changes, user=None, action='update'):
+    if not changes:
+        return
+
+    entry = {
+        'object_type': object_type,
+        'object_id': object_id,
+        'action': action,
+        'changes': changes,
+        'changed_by_id': user.pk if user is not None and user.is_authenticated else None,
+        'created_at': timezone.now(),
+    }
+    if WRITE_BEHIND:
+        transaction.on_commit(lambda: change_writer.put(entry))
+    else:
+        transaction.on_commit(lambda: change_writer._write([entry]))
@@ -0,0 +1,87 @@
+import re
+
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+_ETAG_RE = re.compile(r'(?:W/)?"(\d+)-(\d+)"')
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'This record was changed by someone else. Reload it and try again.'
+    default_code = 'precondition_failed'
+
+
+def etag_for(instance):
+    return f'"{instance.pk}-{instance.version}"'
+
+
+class PreconditionRequired(APIException):
+    status_code = status.HTTP_428_PRECONDITION_REQUIRED
+    default_detail = 'Send the version you are editing in If-Match (the ETag) or as "version".'
+    default_code = 'precondition_required'
+
+
+# The version the client based its edit on: the If-Match ETag for `instance`, otherwise the
+# `supplied` body value. Falling back to the version this request just read would guard nothing.
+def expected_version(request, instance, supplied=None):
+    header = request.META.get('HTTP_IF_MATCH') if request is not None else None
+    if header:
+        if header.strip() == '*':
+            return instance.version
+        for pk, version in _ETAG_RE.findall(header):
+            if int(pk) == instance.pk:
+                return int(version)
+        raise PreconditionFailed()
+
+    if supplied is None:
+        raise PreconditionRequired()
+    if isinstance(supplied, bool):
+        raise ValidationError({'version': ['Expected an integer.']})
+    try:
+        return int(supplied)
+    except (TypeError, ValueError):
+        raise ValidationError({'version': ['Expected an integer.']})
+
+
+def supplied_version(data):
+    return data.get('version') if isinstance(data, dict) else None
+
+
+# UPDATE ... SET <changes>, version = version + 1 WHERE pk = ? AND version = ?
+# Writes only the changed columns and raises 412 when another writer got there first.
+def conditional_update(instance, expected, changes):
+    model = type(instance)
+    values = dict(changes)
+    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        values['updated_at'] = timezone.now()
+
+    updated = model.objects.filter(pk=instance.pk, version=expected).update(**values, version=F('version') + 1)
+    if not updated:
+        raise PreconditionFailed()
+
+    for field, value in values.items():
+        setattr(instance, field, value)
+    instance.version = expected + 1
+    return instance
+
+
+def changed_fields(instance, data):
+    return {field: value for field, value in data.items() if getattr(instance, field) != value}
+
+
+class VersionETagMixin:
+    # Sends the ETag of the object a detail view returned or updated
+    def get_object(self):
+        obj = super().get_object()
+        self.etag_instance = obj
+        return obj
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        instance = getattr(self, 'etag_instance', None)
+        if instance is not None and response.status_code < 300 and not response.has_header('ETag'):
+            response['ETag'] = etag_for(instance)
+        return response
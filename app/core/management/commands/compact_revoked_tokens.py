@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = 'Delete revoked token entries whose tokens have already expired'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        cutoff = timezone.now()
+        total = 0
+
+        while True:
+            ids = list(RevokedToken.objects
+                       .filter(expires_at__lte=cutoff)
+                       .values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            deleted, _ = RevokedToken.objects.filter(id__in=ids).delete()
+            total += deleted
+
+        self.stdout.write(self.style.SUCCESS(f'Removed {total} expired revoked token(s).'))
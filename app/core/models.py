@@ -1,6 +1,8 @@
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinLengthValidator, MaxLengthValidator, MaxValueValidator
-from django.db import models
+from django.db import models, connection
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -13,10 +15,27 @@ class UserManager(BaseUserManager):
             raise ValueError('The Email field must be set')
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
-        user.set_password(password)
+        if password is None:
+            user.set_unusable_password()
+        else:
+            # Same as set_password(), with the hashing done on the bounded pool
+            from auth.hashing import hashing_pool
+            user.password = hashing_pool.make_password(password)
+            user._password = password
         user.save(using=self._db)
         return user
 
+    # Single UPDATE ... RETURNING so concurrent failures can neither be lost nor overshoot the limit
+    def increment_attempt(self, user_id, max_attempts):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {self.model._meta.db_table} SET attempt = attempt + 1 '
+                f'WHERE id = %s AND attempt < %s RETURNING attempt',
+                [user_id, max_attempts],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else max_attempts
+
     def create_superuser(self, email, password=None, **extra_fields):
         extra_fields.setdefault('is_staff', True)
         extra_fields.setdefault('is_superuser', True)
@@ -55,6 +74,107 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.email
 
+class RevokedToken(models.Model):
+    jti = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='revoked_tokens', null=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)  # Sync watermark, see auth.revocation
+
+    def __str__(self):
+        return self.jti
+
+class ExportJob(models.Model):
+    KIND_CHOICES = [
+        ('job_postings', 'Job Postings'),
+        ('prfs', 'PRFs'),
+    ]
+
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('xlsx', 'XLSX'),
+        ('ndjson', 'NDJSON'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    filters = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    file_path = models.CharField(max_length=500, blank=True)
+    row_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, related_name='export_jobs', null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.get_kind_display()} export ({self.format}) - {self.status}'
+
+class ImportJob(models.Model):
+    KIND_CHOICES = [
+        ('job_postings', 'Job Postings'),
+        ('clients', 'Clients'),
+    ]
+
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES)
+    source = models.CharField(max_length=500)
+    offset = models.BigIntegerField(default=0)  # Resume point in the source file
+    imported_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, related_name='import_jobs', null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'source', 'status'], name='import_job_resume_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()} import from {self.source} - {self.status}'
+
+# Field-level change log; written in batches by core.audit after the change commits
+class ChangeHistory(models.Model):
+    OBJECT_TYPE_CHOICES = [
+        ('client', 'Client'),
+        ('prf', 'PRF'),
+        ('job_posting', 'Job Posting'),
+    ]
+
+    ACTION_CHOICES = [
+        ('update', 'Update'),
+        ('delete', 'Delete'),
+    ]
+
+    object_type = models.CharField(max_length=30, choices=OBJECT_TYPE_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES, default='update')
+    changes = models.JSONField(default=dict)  # {field: [old, new]}
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, related_name='changes_made', null=True)
+    created_at = models.DateTimeField()  # When the change was made, not when the row was written
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['object_type', 'object_id', '-created_at', '-id'], name='change_history_object_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.object_type} {self.object_id} {self.action} at {self.created_at}'
+
 # FOR CLIENT JOB POSTING SYSTEM
 class Client(models.Model):
     name = models.CharField(max_length=255, unique=True)
@@ -69,9 +189,23 @@ class Client(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='client_created_id_idx'),
+            models.Index(fields=['posted_by', 'created_at', 'id'], name='client_posted_by_created_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
+def _bump_version(instance, save_kwargs):
+    # Plain save() calls (admin, scripts) also advance the version so outstanding ETags go stale
+    if instance.pk is None or save_kwargs.get('force_insert'):
+        return
+    instance.version += 1
+    if save_kwargs.get('update_fields') is not None:
+        save_kwargs['update_fields'] = {*save_kwargs['update_fields'], 'version'}
+
 # Normalize Tables Down Here
 class JobPosting(models.Model):
     DEPARTMENT_NAME_CHOICES = [
@@ -132,20 +266,40 @@ class JobPosting(models.Model):
     posted_by = models.ForeignKey(User, on_delete=models.SET_NULL, related_name='posted_job_postings', null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)  # Maintained by job.signals
+    version = models.PositiveIntegerField(default=1)  # Optimistic concurrency, see core.concurrency
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='job_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+            # Public board: status='active' AND published AND active, newest first
+            models.Index(fields=['status', '-created_at', '-id'], name='job_public_board_idx',
+                         condition=models.Q(active=True, published=True)),
+            # "My postings": posted_by + active, optionally narrowed by status/type
+            models.Index(fields=['posted_by', 'active', 'status', 'type'], name='job_posted_by_filters_idx'),
+        ]
 
-    # Logic for approving managers (Not Fully Implemented)
     def get_editable_statuses_for_hiring_manager(self):
         return ['draft', 'closed', 'cancelled', 'pending']
 
-    def set_status(self, new_status, approved_by_managers=0):
+    PRF_APPROVAL_THRESHOLD = 3
+
+    # approved_by_managers is the PRFApproval count from the database (see prf.approvals)
+    def set_status(self, new_status, approved_by_managers=0, commit=True):
         if self.type == 'prf':
-            if new_status == 'active' and approved_by_managers < 3:
-                raise ValueError('Cannot set status to active unless approved by 3 managers.')
+            if new_status == 'active' and approved_by_managers < self.PRF_APPROVAL_THRESHOLD:
+                raise ValueError(f'Cannot set status to active unless approved by {self.PRF_APPROVAL_THRESHOLD} managers.')
             if new_status not in self.get_editable_statuses_for_hiring_manager() and new_status != 'active':
                 raise ValueError('Status not editable by hiring manager.')
 
         self.status = new_status
-        self.save()
+        if commit:
+            self.save(update_fields=['status', 'updated_at'])
+
+    def save(self, *args, **kwargs):
+        _bump_version(self, kwargs)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.job_title
@@ -173,10 +327,36 @@ class PRF(models.Model):
     is_salary_range = models.BooleanField(default=False)
     assessment_required = models.BooleanField(default=False)
     other_assessment = ArrayField(models.TextField())
+    version = models.PositiveIntegerField(default=1)  # Optimistic concurrency, see core.concurrency
+
+    def save(self, *args, **kwargs):
+        _bump_version(self, kwargs)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f'PRF: {self.job_posting.job_title} - {self.job_posting.department_name} ({self.business_unit})'
 
+class PRFApproval(models.Model):
+    DECISION_CHOICES = [
+        ('approved', 'Approved'),
+        ('rejected', 'Rejected'),
+    ]
+
+    prf = models.ForeignKey(PRF, on_delete=models.CASCADE, related_name='approvals')
+    manager = models.ForeignKey(User, on_delete=models.CASCADE, related_name='prf_approvals')
+    decision = models.CharField(max_length=20, choices=DECISION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # One vote per manager; re-voting upserts onto this row
+            models.UniqueConstraint(fields=['prf', 'manager'], name='prf_approval_unique_manager'),
+        ]
+
+    def __str__(self):
+        return f'{self.manager} {self.decision} PRF {self.prf_id}'
+
 class AssessmentType(models.Model):
     prfs = models.ForeignKey(PRF, on_delete=models.SET_NULL, related_name='assessment_types', null=True)
     name = models.CharField(max_length=100)
@@ -198,7 +378,38 @@ class SoftwareRequirement(models.Model):
     def __str__(self):
         return f"{self.name} - {self.prfs.job_posting.job_title}"
 
-# Client Position
+# Read model for the PRF dashboard, one row per PRF; maintained by prf.summary
+class PRFSummary(models.Model):
+    prf = models.OneToOneField(PRF, on_delete=models.CASCADE, primary_key=True, related_name='summary')
+    job_posting_id = models.IntegerField(null=True)
+    job_title = models.CharField(max_length=255, blank=True)
+    department_name = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=100, blank=True)
+    active = models.BooleanField(default=True)
+    business_unit = models.CharField(max_length=100)
+    position = models.CharField(max_length=100)
+    category = models.CharField(max_length=100)
+    number_of_vacancies = models.IntegerField(default=0)
+    target_start_date = models.DateField(null=True)
+    immediate_supervisor_name = models.CharField(max_length=255, blank=True)
+    hiring_manager_ids = ArrayField(models.IntegerField(), default=list)
+    hiring_manager_names = ArrayField(models.CharField(max_length=255), default=list)
+    assessment_type_count = models.IntegerField(default=0)
+    hardware_requirement_count = models.IntegerField(default=0)
+    software_requirement_count = models.IntegerField(default=0)
+    approval_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(null=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['active', 'business_unit', 'status'], name='prf_summary_filters_idx'),
+            GinIndex(fields=['hiring_manager_ids'], name='prf_summary_managers_idx'),
+        ]
+
+    def __str__(self):
+        return f'Summary: {self.job_title} ({self.business_unit})'
+
 class Position(models.Model):
     EDUCATION_LEVEL_CHOICES = [
         ('high_school', 'High School'),
@@ -289,7 +500,11 @@ class PipelineStep(models.Model):
     )
 
     class Meta:
-        unique_together = ('position', 'stage', 'order',)
+        constraints = [
+            # Checked at the end of each statement, so one UPDATE can swap orders (see position.pipeline)
+            models.UniqueConstraint(fields=['position', 'stage', 'order'], name='pipeline_step_unique_order',
+                                    deferrable=models.Deferrable.IMMEDIATE),
+        ]
         ordering = ['stage', 'order']
 
     def __str__(self):
@@ -0,0 +1,59 @@
+import json
+
+from django.db import connection
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+def approximate_count(queryset):
+    # Planner estimate instead of COUNT(*): pg_class.reltuples for a whole table,
+    # the EXPLAIN row estimate when the queryset is filtered
+    model = queryset.model
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                           [model._meta.db_table])
+            row = cursor.fetchone()
+            return max(row[0], 0) if row else None
+
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]['Plan']['Plan Rows']
+
+
+class KeysetPagination(CursorPagination):
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.include_total = request.query_params.get('approx_total', 'false').lower() == 'true'
+        if self.include_total:
+            self.approximate_total = approximate_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.include_total:
+            payload['approximate_total'] = self.approximate_total
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['approximate_total'] = {'type': 'integer', 'nullable': True}
+        return response_schema
+
+
+class IdKeysetPagination(KeysetPagination):
+    ordering = ('-id',)
+
+
+def is_cursor_mode(request):
+    return request.query_params.get('pagination') == 'cursor'
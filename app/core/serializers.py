@@ -0,0 +1,11 @@
+from rest_framework import serializers
+
+from core.models import ChangeHistory
+
+
+class ChangeHistorySerializer(serializers.ModelSerializer):
+    changed_by_name = serializers.CharField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = ChangeHistory
+        fields = ['id', 'action', 'changes', 'changed_by', 'changed_by_name', 'created_at']
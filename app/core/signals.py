@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from auth.cache import user_claims_cache
+from core.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_claims(sender, instance, **kwargs):
+    user_claims_cache.invalidate(instance.pk)
@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+
+
+# Counts plus the first synced field (e.g. the names) before and after, for change history
+@dataclass
+class SyncResult:
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    before: list = field(default_factory=list)
+    after: list = field(default_factory=list)
+
+    @property
+    def changed(self):
+        return bool(self.created or self.updated or self.deleted)
+
+
+# Values are checked here because the rows are bulk written: a bad value would otherwise surface as a database error
+def _clean_value(model, name, value):
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f'{name} must be a non-empty string.')
+    max_length = model._meta.get_field(name).max_length
+    if max_length is not None and len(value) > max_length:
+        raise ValueError(f'{name} must be at most {max_length} characters.')
+    return value
+
+
+# Make the children of `parent` on `fk_name` match `items` exactly:
+#   {'id': 3, 'name': 'x'} updates row 3, {'name': 'x'} or 'x' creates a row, missing ids are deleted.
+# Cost is fixed: one SELECT, then at most one DELETE, one bulk UPDATE and one bulk INSERT.
+def sync_children(parent, items, model, fk_name, fields=('name',)):
+    if items is None:
+        return SyncResult()
+
+    existing = {obj.id: obj for obj in model.objects.filter(**{fk_name: parent}).only('id', *fields).order_by('id')}
+    before = [getattr(obj, fields[0]) for obj in existing.values()]
+    to_create, to_update, keep_ids = [], [], set()
+
+    for item in items:
+        if not isinstance(item, dict):
+            item = {fields[0]: item}
+
+        item_id = item.get('id')
+        if item_id is None:
+            if any(item.get(name) is None for name in fields):
+                raise ValueError(f'New items need: {", ".join(fields)}.')
+            values = {name: _clean_value(model, name, item[name]) for name in fields}
+            to_create.append(model(**{fk_name: parent}, **values))
+            continue
+
+        try:
+            obj = existing[int(item_id)]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f'Item {item_id} does not belong to this record.')
+        if obj.id in keep_ids:
+            raise ValueError(f'Item {item_id} is listed more than once.')
+        keep_ids.add(obj.id)
+
+        changed = False
+        for name in fields:
+            if name in item and getattr(obj, name) != _clean_value(model, name, item[name]):
+                setattr(obj, name, item[name])
+                changed = True
+        if changed:
+            to_update.append(obj)
+
+    to_delete = set(existing) - keep_ids
+    if to_delete:
+        model.objects.filter(id__in=to_delete).delete()
+    if to_update:
+        model.objects.bulk_update(to_update, list(fields))
+    if to_create:
+        model.objects.bulk_create(to_create)
+
+    after = [getattr(obj, fields[0]) for obj_id, obj in existing.items() if obj_id in keep_ids]
+    after.extend(getattr(obj, fields[0]) for obj in to_create)
+    return SyncResult(created=len(to_create), updated=len(to_update), deleted=len(to_delete),
+                      before=before, after=after)
@@ -1,3 +1,103 @@
+from unittest import mock
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.audit import record_change
+from core.models import AssessmentType, ChangeHistory, User
+from core.sync import sync_children
+from job.tests import make_hiring_manager
+from prf.tests import make_prfs
+
+
+@mock.patch('core.audit.WRITE_BEHIND', False)
+class ChangeHistoryTests(TestCase):
+    def setUp(self):
+        self.manager = make_hiring_manager()
+        self.prf = make_prfs(1, hiring_managers=[self.manager])[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def test_requirement_list_changes_are_recorded(self):
+        assessment_ids = list(self.prf.assessment_types.order_by('id').values_list('id', flat=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/prf/{self.prf.id}/', {
+                'version': 1,
+                'position': 'Lead',
+                'assessment_types': [{'id': assessment_ids[0], 'name': 'Renamed'}, 'Added'],
+                'software_requirements': ['first', 'second'],  # Unchanged names, but new rows
+            }, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+
+        response = self.client.get(f'/api/prf/{self.prf.id}/history/')
+        self.assertEqual(response.status_code, 200)
+        [entry] = response.data['results']
+        self.assertEqual(entry['changes']['position'], ['Associate', 'Lead'])
+        self.assertEqual(entry['changes']['assessment_types'], [['first', 'second'], ['Renamed', 'Added']])
+        self.assertIn('software_requirements', entry['changes'])
+        self.assertNotIn('hardware_requirements', entry['changes'])
+
+    def test_history_is_limited_to_people_who_can_edit_the_record(self):
+        outsider = make_hiring_manager('outsider@example.com')
+        staff = User.objects.create_user('staff@example.com', 'password', first_name='Staff', last_name='User',
+                                         role='manager')
+        admin = User.objects.create_superuser('admin@example.com', 'password', first_name='Admin', last_name='User')
+        urls = [f'/api/prf/{self.prf.id}/history/', f'/api/job/{self.prf.job_posting_id}/history/']
+
+        for url in urls:
+            self.assertEqual(self.client.get(url).status_code, 200, url)
+            for user, expected in ((outsider, 403), (staff, 403), (admin, 200)):
+                client = APIClient()
+                client.force_authenticate(user)
+                self.assertEqual(client.get(url).status_code, expected, (url, user.email))
+
+        client = APIClient()
+        client.force_authenticate(staff)
+        self.assertEqual(client.get('/api/client/1/history/').status_code, 403)
+        self.assertEqual(self.client.get('/api/client/1/history/').status_code, 200)
+
+    def test_object_ids_beyond_32_bits_are_stored(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record_change('job_posting', 2 ** 40, {'job_title': ['Old', 'New']}, self.manager)
+        self.assertTrue(ChangeHistory.objects.filter(object_type='job_posting', object_id=2 ** 40).exists())
+
+
+class SyncChildrenTests(TestCase):
+    def setUp(self):
+        self.prf = make_prfs(1)[0]
+        self.first_id = AssessmentType.objects.filter(prfs=self.prf).order_by('id').values_list('id', flat=True)[0]
+
+    def _sync(self, items):
+        return sync_children(self.prf, items, AssessmentType, 'prfs')
+
+    def test_statement_count_does_not_grow_with_the_items(self):
+        # Select, delete, bulk update and bulk insert whether one or fifty rows are added
+        with self.assertNumQueries(4):
+            result = self._sync([{'id': self.first_id, 'name': 'Renamed'}, 'New'])
+        self.assertEqual((result.created, result.updated, result.deleted), (1, 1, 1))
+
+        new_id = AssessmentType.objects.get(prfs=self.prf, name='New').id
+        with self.assertNumQueries(4):
+            result = self._sync([{'id': self.first_id, 'name': 'Again'}] + [f'New {index}' for index in range(50)])
+        self.assertEqual((result.created, result.updated, result.deleted), (50, 1, 1))
+        self.assertFalse(AssessmentType.objects.filter(id=new_id).exists())
+        self.assertEqual(AssessmentType.objects.filter(prfs=self.prf).count(), 51)
+
+    def test_invalid_values_are_rejected_before_writing(self):
+        for items in ([{'id': self.first_id, 'name': None}], [{'id': self.first_id, 'name': 5}], [''],
+                      [{'name': ['x']}], ['x' * 101]):
+            with self.assertRaises(ValueError, msg=items), self.assertNumQueries(1):
+                self._sync(items)
+        names = AssessmentType.objects.filter(prfs=self.prf).order_by('id').values_list('name', flat=True)
+        self.assertEqual(list(names), ['first', 'second'])
 
-# Create your tests here.
+    def test_invalid_value_is_a_400(self):
+        manager = make_hiring_manager()
+        self.prf.hiring_managers.add(manager)
+        client = APIClient()
+        client.force_authenticate(manager)
+        response = client.patch(f'/api/prf/{self.prf.id}/', {
+            'version': 1, 'assessment_types': [{'id': self.first_id, 'name': None}],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('assessment_types', response.data)
@@ -1,3 +1,50 @@
-from django.shortcuts import render
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, NullIf
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAuthenticated
 
-# Create your views here.
+from core.models import ChangeHistory, JobPosting, PRF
+from core.pagination import KeysetPagination
+from core.serializers import ChangeHistorySerializer
+
+
+# Who may read an object's history besides superusers: the people who can edit it
+def _can_view_client_history(user, pk):
+    return user.role == 'hiring_manager'
+
+
+def _can_view_prf_history(user, pk):
+    return PRF.objects.filter(Q(hiring_managers=user) | Q(job_posting__posted_by=user), pk=pk).exists()
+
+
+def _can_view_job_posting_history(user, pk):
+    return JobPosting.objects.filter(Q(posted_by=user) | Q(prf__hiring_managers=user), pk=pk).exists()
+
+
+HISTORY_ACCESS = {
+    'client': _can_view_client_history,
+    'prf': _can_view_prf_history,
+    'job_posting': _can_view_job_posting_history,
+}
+
+
+# GET <object>/<pk>/history/, newest first; routed per app with as_view(object_type=...)
+class ChangeHistoryView(ListAPIView):
+    serializer_class = ChangeHistorySerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    object_type = None
+
+    def check_permissions(self, request):
+        super().check_permissions(request)
+        user = request.user
+        if not user.is_superuser and not HISTORY_ACCESS[self.object_type](user, self.kwargs['pk']):
+            raise PermissionDenied('Only people who can edit this record can read its history.')
+
+    def get_queryset(self):
+        return (ChangeHistory.objects
+                .filter(object_type=self.object_type, object_id=self.kwargs['pk'])
+                .annotate(changed_by_name=NullIf(
+                    Concat('changed_by__first_name', Value(' '), 'changed_by__last_name'), Value(' ')
+                )))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import ExportJob
+from exports.worker import run_export
+
+
+class Command(BaseCommand):
+    help = 'Run pending export jobs (e.g. ones left behind by a restarted web process)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new jobs')
+        parser.add_argument('--interval', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            pending = list(ExportJob.objects.filter(status='pending').order_by('id').values_list('id', flat=True))
+            for export_job_id in pending:
+                run_export(export_job_id)
+                self.stdout.write(f'Processed export job {export_job_id}')
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
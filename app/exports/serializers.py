@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+from core.models import ExportJob
+from exports.writers import xlsx_available
+from prf.filters import filter_prfs
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ExportJob
+        fields = ['id', 'kind', 'format', 'filters', 'status', 'row_count', 'error', 'created_at', 'started_at',
+                  'finished_at']
+        read_only_fields = ['status', 'row_count', 'error', 'created_at', 'started_at', 'finished_at']
+
+    def validate_format(self, value):
+        if value == 'xlsx' and not xlsx_available():
+            raise serializers.ValidationError('XLSX exports require openpyxl to be installed.')
+        return value
+
+    def validate_filters(self, value):
+        if not isinstance(value, dict) or not all(isinstance(v, str) for v in value.values()):
+            raise serializers.ValidationError('Filters must be an object of query parameter strings.')
+        return value
+
+    def validate(self, attrs):
+        # Builds the (lazy) queryset now so bad filter values are a 400 here, not a failed job later
+        if attrs.get('kind') == 'prfs':
+            try:
+                filter_prfs(attrs.get('filters') or {})
+            except serializers.ValidationError as e:
+                raise serializers.ValidationError({'filters': e.detail})
+        return attrs
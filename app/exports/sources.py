@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Prefetch
+
+from core.models import JobPosting, User
+from job.filters import filter_job_postings
+from prf.filters import filter_prfs
+
+CHUNK_SIZE = getattr(settings, 'EXPORTS', {}).get('CHUNK_SIZE', 2000)
+
+JOB_POSTING_COLUMNS = [
+    field.attname for field in JobPosting._meta.concrete_fields if field.name != 'search_vector'
+]
+
+PRF_COLUMNS = [
+    'id', 'business_unit', 'category', 'position', 'number_of_vacancies', 'interview_levels',
+    'work_schedule_from', 'work_schedule_to', 'salary_budget', 'is_salary_range', 'assessment_required',
+    'other_assessment', 'non_negotiables',
+]
+
+PRF_JOB_POSTING_COLUMNS = [
+    'job_title', 'department_name', 'status', 'employment_type', 'work_setup', 'working_site',
+    'target_start_date', 'min_salary', 'max_salary', 'published',
+]
+
+
+def _flatten(value):
+    return '; '.join(str(item) for item in value) if isinstance(value, list) else value
+
+
+# Each source returns (header, rows); rows is a lazy iterator so memory stays flat
+def job_posting_rows(export_job):
+    user = export_job.requested_by or AnonymousUser()
+    queryset = filter_job_postings(user, export_job.filters).values_list(*JOB_POSTING_COLUMNS)
+    return JOB_POSTING_COLUMNS, queryset.iterator(chunk_size=CHUNK_SIZE)
+
+
+def prf_rows(export_job):
+    queryset = (filter_prfs(export_job.filters)
+                .select_related('job_posting', 'immediate_supervisor')
+                .prefetch_related(
+                    Prefetch('hiring_managers', queryset=User.objects.only('id', 'first_name', 'last_name')),
+                    'assessment_types',
+                    'hardware_requirements',
+                    'software_requirements',
+                ))
+
+    header = (PRF_COLUMNS
+              + [f'job_posting_{column}' for column in PRF_JOB_POSTING_COLUMNS]
+              + ['immediate_supervisor', 'hiring_managers', 'assessment_types', 'hardware_requirements',
+                 'software_requirements'])
+
+    def rows():
+        # chunk_size lets prefetch_related run once per chunk instead of per row
+        for prf in queryset.iterator(chunk_size=CHUNK_SIZE):
+            job_posting = prf.job_posting
+            supervisor = prf.immediate_supervisor
+            yield ([_flatten(getattr(prf, column)) for column in PRF_COLUMNS]
+                   + [getattr(job_posting, column) if job_posting else None for column in PRF_JOB_POSTING_COLUMNS]
+                   + [f'{supervisor.first_name} {supervisor.last_name}' if supervisor else None,
+                      '; '.join(f'{user.first_name} {user.last_name}' for user in prf.hiring_managers.all()),
+                      '; '.join(item.name for item in prf.assessment_types.all()),
+                      '; '.join(item.name for item in prf.hardware_requirements.all()),
+                      '; '.join(item.name for item in prf.software_requirements.all())])
+
+    return header, rows()
+
+
+SOURCES = {
+    'job_postings': job_posting_rows,
+    'prfs': prf_rows,
+}
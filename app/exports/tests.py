@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import ExportJob
+from exports.sources import JOB_POSTING_COLUMNS
+from exports.worker import run_export
+from job.tests import make_hiring_manager, make_job_posting
+from prf.tests import make_prfs
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch('exports.worker.EXPORT_DIRECTORY', Path(directory.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = make_hiring_manager()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _export(self, kind, file_format='csv', filters=None):
+        # The worker pool is left out: the job runs here once the request has committed
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.client.post('/api/export/', {'kind': kind, 'format': file_format, 'filters': filters or {}},
+                                        format='json')
+        self.assertEqual(response.status_code, 202, response.data)
+        run_export(response.data['id'])
+        return ExportJob.objects.get(id=response.data['id'])
+
+    def _download(self, export_job):
+        response = self.client.get(f'/api/export/{export_job.id}/download/')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_export_streams_every_chunk(self):
+        postings = [make_job_posting(job_title=f'Posting {index}', posted_by=self.user) for index in range(25)]
+        with mock.patch('exports.sources.CHUNK_SIZE', 10):
+            export_job = self._export('job_postings', filters={'my_postings': 'true'})
+
+        self.assertEqual(export_job.status, 'completed', export_job.error)
+        self.assertEqual(export_job.row_count, 25)
+        rows = list(csv.reader(io.StringIO(self._download(export_job))))
+        self.assertEqual(rows[0], JOB_POSTING_COLUMNS)
+        self.assertEqual(len(rows), 26)
+        by_id = {row[0]: dict(zip(rows[0], row)) for row in rows[1:]}
+        self.assertEqual(by_id[str(postings[3].id)]['job_title'], 'Posting 3')
+        self.assertEqual(by_id[str(postings[3].id)]['posted_by_id'], str(self.user.id))
+
+    def test_ndjson_prf_export_flattens_relations(self):
+        make_prfs(3, hiring_managers=[self.user])
+        export_job = self._export('prfs', 'ndjson')
+
+        self.assertEqual(export_job.row_count, 3)
+        records = [json.loads(line) for line in self._download(export_job).splitlines()]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]['hiring_managers'], 'Hiring Manager')
+        self.assertEqual(records[0]['assessment_types'], 'first; second')
+        self.assertEqual(records[0]['job_posting_status'], 'pending')
+
+    def test_only_the_requester_or_a_superuser_sees_an_export(self):
+        make_job_posting(posted_by=self.user)
+        export_job = self._export('job_postings')
+
+        other = APIClient()
+        other.force_authenticate(make_hiring_manager('other@example.com'))
+        self.assertEqual(other.get(f'/api/export/{export_job.id}/').status_code, 404)
+        self.assertEqual(other.get(f'/api/export/{export_job.id}/download/').status_code, 404)
+        self.assertEqual(APIClient().get(f'/api/export/{export_job.id}/download/').status_code, 401)
+        self.assertEqual(APIClient().post('/api/export/', {'kind': 'prfs'}, format='json').status_code, 401)
+
+    def test_unfinished_export_is_not_downloadable(self):
+        export_job = ExportJob.objects.create(kind='job_postings', format='csv', requested_by=self.user)
+        response = self.client.get(f'/api/export/{export_job.id}/download/')
+        self.assertEqual(response.status_code, 409)
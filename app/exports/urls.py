@@ -0,0 +1,9 @@
+from django.urls import path
+
+from exports.views import ExportJobCreateView, ExportJobDetailView, ExportJobDownloadView
+
+urlpatterns = [
+    path('', ExportJobCreateView.as_view(), name='export-create'),
+    path('<int:pk>/', ExportJobDetailView.as_view(), name='export-detail'),
+    path('<int:pk>/download/', ExportJobDownloadView.as_view(), name='export-download'),
+]
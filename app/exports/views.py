@@ -0,0 +1,54 @@
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.generics import RetrieveAPIView, get_object_or_404
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.models import ExportJob
+from exports.serializers import ExportJobSerializer
+from exports.worker import enqueue
+
+
+# Create your views here.
+class ExportJobOwnerMixin:
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_superuser:
+            return ExportJob.objects.all()
+        return ExportJob.objects.filter(requested_by=user)
+
+
+class ExportJobCreateView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = ExportJobSerializer(data=request.data)
+        if serializer.is_valid():
+            export_job = serializer.save(requested_by=request.user)
+            enqueue(export_job)
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ExportJobDetailView(ExportJobOwnerMixin, RetrieveAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = ExportJobSerializer
+    lookup_field = 'pk'
+
+
+class ExportJobDownloadView(ExportJobOwnerMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        export_job = get_object_or_404(self.get_queryset(), pk=pk)
+        if export_job.status != 'completed':
+            return Response({'detail': f'Export is {export_job.status}.'}, status=status.HTTP_409_CONFLICT)
+
+        try:
+            file = open(export_job.file_path, 'rb')
+        except FileNotFoundError:
+            return Response({'detail': 'Export file is no longer available.'}, status=status.HTTP_410_GONE)
+
+        filename = export_job.file_path.replace('\\', '/').rsplit('/', 1)[-1]
+        return FileResponse(file, as_attachment=True, filename=filename)
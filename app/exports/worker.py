@@ -0,0 +1,66 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from core.models import ExportJob
+from exports.sources import SOURCES
+from exports.writers import WRITERS
+
+logger = logging.getLogger(__name__)
+
+_config = getattr(settings, 'EXPORTS', {})
+EXPORT_DIRECTORY = Path(_config.get('DIRECTORY', settings.BASE_DIR / 'var' / 'exports'))
+
+_executor = ThreadPoolExecutor(max_workers=_config.get('WORKERS', 2), thread_name_prefix='export')
+
+
+def enqueue(export_job):
+    # Submit only once the row is committed, otherwise the worker may not see it yet
+    transaction.on_commit(lambda: _executor.submit(_run_in_thread, export_job.id))
+
+
+def _run_in_thread(export_job_id):
+    try:
+        run_export(export_job_id)
+    finally:
+        connections.close_all()
+
+
+def run_export(export_job_id):
+    # Claim the job atomically so a management-command worker and the in-process pool never both run it
+    claimed = ExportJob.objects.filter(id=export_job_id, status='pending').update(
+        status='running', started_at=timezone.now())
+    if not claimed:
+        return
+
+    export_job = ExportJob.objects.select_related('requested_by').get(id=export_job_id)
+    writer_class = WRITERS[export_job.format]
+    EXPORT_DIRECTORY.mkdir(parents=True, exist_ok=True)
+    path = EXPORT_DIRECTORY / f'{export_job.kind}-{export_job.id}.{writer_class.extension}'
+    partial_path = path.with_suffix(path.suffix + '.part')
+
+    try:
+        header, rows = SOURCES[export_job.kind](export_job)
+        writer = writer_class(partial_path, header)
+        row_count = 0
+        try:
+            for row in rows:
+                writer.write_row(row)
+                row_count += 1
+        finally:
+            writer.close()
+        os.replace(partial_path, path)
+    except Exception as e:
+        logger.exception('Export job %s failed', export_job_id)
+        partial_path.unlink(missing_ok=True)
+        ExportJob.objects.filter(id=export_job_id).update(
+            status='failed', error=str(e), finished_at=timezone.now())
+        return
+
+    ExportJob.objects.filter(id=export_job_id).update(
+        status='completed', file_path=str(path), row_count=row_count, finished_at=timezone.now())
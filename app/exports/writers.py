@@ -0,0 +1,76 @@
+import csv
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # XLSX exports are only offered when openpyxl is installed
+    Workbook = None
+
+
+def xlsx_available():
+    return Workbook is not None
+
+
+class CsvWriter:
+    extension = 'csv'
+
+    def __init__(self, path, header):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(header)
+
+    def write_row(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class NdjsonWriter:
+    extension = 'ndjson'
+
+    def __init__(self, path, header):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.header = header
+
+    def write_row(self, row):
+        self.file.write(json.dumps(dict(zip(self.header, row)), cls=DjangoJSONEncoder))
+        self.file.write('\n')
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxWriter:
+    extension = 'xlsx'
+
+    def __init__(self, path, header):
+        # write_only streams rows to a temp file instead of holding the sheet in memory
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        self.sheet.append(header)
+
+    def _cell(self, value):
+        if isinstance(value, datetime) and timezone.is_aware(value):
+            return timezone.make_naive(value, dt_timezone.utc)
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, cls=DjangoJSONEncoder)
+        return value
+
+    def write_row(self, row):
+        self.sheet.append([self._cell(value) for value in row])
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+WRITERS = {
+    'csv': CsvWriter,
+    'ndjson': NdjsonWriter,
+    'xlsx': XlsxWriter,
+}
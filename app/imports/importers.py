@@ -0,0 +1,155 @@
+from django.db import transaction
+
+from core.models import Client, JobPosting
+from imports.serializers import ClientImportSerializer, JobPostingImportSerializer
+from job.signals import job_postings_changed
+
+MAX_REPORTED_ERRORS = 1000
+
+
+class Importer:
+    model = None
+    serializer_class = None
+    unique_field = None
+
+    def __init__(self, user):
+        self.user = user
+        self.seen_unique = set()
+
+    def build(self, validated_data):
+        return self.model(posted_by=self.user, **validated_data)
+
+    def after_create(self, objects):
+        pass
+
+    def validate_batch(self, batch):
+        valid, errors = [], []
+
+        # Pass 1: field validation without touching the database
+        for row_number, start, end, record in batch:
+            if isinstance(record, ValueError):
+                errors.append((row_number, start, {'non_field_errors': [f'Invalid JSON: {record}']}))
+                continue
+            if not isinstance(record, dict):
+                errors.append((row_number, start, {'non_field_errors': ['Row is not an object.']}))
+                continue
+            serializer = self.serializer_class(data=record)
+            if serializer.is_valid():
+                valid.append((row_number, start, serializer.validated_data))
+            else:
+                errors.append((row_number, start, serializer.errors))
+
+        if self.unique_field is None:
+            return valid, errors
+
+        # Pass 2: one set query for the whole batch, plus duplicates inside the file
+        values = {data[self.unique_field] for _, _, data in valid}
+        existing = set(self.model.objects
+                       .filter(**{f'{self.unique_field}__in': values})
+                       .values_list(self.unique_field, flat=True))
+        unique_valid = []
+        for row_number, start, data in valid:
+            value = data[self.unique_field]
+            if value in existing or value in self.seen_unique:
+                errors.append((row_number, start, self.duplicate_error()))
+            else:
+                self.seen_unique.add(value)
+                unique_valid.append((row_number, start, data))
+        return unique_valid, errors
+
+    def duplicate_error(self):
+        return {self.unique_field: [f'{self.model._meta.verbose_name} with this {self.unique_field} already exists.']}
+
+    # Returns (created objects, rows that lost a uniqueness race as (row_number, start, errors))
+    def create(self, valid, batch_size):
+        objects = [self.build(data) for _, _, data in valid]
+        if self.unique_field is None:
+            return self.model.objects.bulk_create(objects, batch_size=batch_size), []
+
+        # Another request can insert the same value between validate_batch and this insert.
+        # ON CONFLICT DO NOTHING skips those rows; re-selecting tells ours apart by the
+        # created_at stamp bulk_create gave each object.
+        self.model.objects.bulk_create(objects, batch_size=batch_size, ignore_conflicts=True)
+        values = [getattr(obj, self.unique_field) for obj in objects]
+        stored = {row[self.unique_field]: row for row in self.model.objects
+                  .filter(**{f'{self.unique_field}__in': values}).values('id', self.unique_field, 'created_at')}
+
+        created, conflicts = [], []
+        for (row_number, start, _data), obj in zip(valid, objects):
+            row = stored.get(getattr(obj, self.unique_field))
+            if row is not None and row['created_at'] == obj.created_at:
+                obj.pk = row['id']
+                created.append(obj)
+            else:
+                conflicts.append((row_number, start, self.duplicate_error()))
+        return created, conflicts
+
+
+class JobPostingImporter(Importer):
+    model = JobPosting
+    serializer_class = JobPostingImportSerializer
+
+    # type is read-only on the serializer; postings without a PRF are client postings
+    def build(self, validated_data):
+        return self.model(posted_by=self.user, type='client', **validated_data)
+
+    def after_create(self, objects):
+        # bulk_create skips post_save; one aggregated event refreshes search vectors and the board cache
+        job_postings_changed.send(sender=JobPosting, ids=[obj.id for obj in objects],
+                                  fields=[field.name for field in JobPosting._meta.concrete_fields])
+
+
+class ClientImporter(Importer):
+    model = Client
+    serializer_class = ClientImportSerializer
+    unique_field = 'name'
+
+
+IMPORTERS = {
+    'job_postings': JobPostingImporter,
+    'clients': ClientImporter,
+}
+
+
+def _batched(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_import(importer, records, offset=0, batch_size=2000, dry_run=False, on_batch=None):
+    report = {
+        'dry_run': dry_run,
+        'imported': 0,
+        'error_count': 0,
+        'errors': [],
+        'next_offset': offset,
+    }
+
+    for batch in _batched(records, batch_size):
+        valid, errors = importer.validate_batch(batch)
+
+        imported = len(valid)
+        if valid and not dry_run:
+            with transaction.atomic():
+                created, conflicts = importer.create(valid, batch_size)
+                importer.after_create(created)
+            imported = len(created)
+            errors = sorted(errors + conflicts, key=lambda error: error[0])
+
+        report['imported'] += imported
+        report['error_count'] += len(errors)
+        for row_number, start, row_errors in errors:
+            if len(report['errors']) < MAX_REPORTED_ERRORS:
+                report['errors'].append({'row': row_number, 'offset': start, 'errors': row_errors})
+        report['next_offset'] = batch[-1][2]
+
+        if on_batch is not None:
+            on_batch(report)
+
+    return report
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import ImportJob, User
+from imports.importers import IMPORTERS, run_import
+from imports.readers import READERS, guess_format
+
+
+class Command(BaseCommand):
+    help = 'Bulk import job postings or clients from a CSV, NDJSON or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS))
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=sorted(READERS))
+        parser.add_argument('--user', help='Email of the user recorded as posted_by')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--dry-run', action='store_true')
+        parser.add_argument('--resume', action='store_true',
+                            help='Continue the last unfinished import of this file from its saved offset')
+        parser.add_argument('--report', help='Write the per-row error report to this JSON file')
+
+    def handle(self, *args, **options):
+        path = Path(options['path']).resolve()
+        if not path.exists():
+            raise CommandError(f'{path} does not exist')
+
+        file_format = options['format'] or guess_format(path.name)
+        if file_format not in READERS:
+            raise CommandError('Could not infer the file format; pass --format')
+
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(email=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f'No user with email {options["user"]}')
+
+        import_job = None
+        offset = 0
+        if not options['dry_run']:
+            if options['resume']:
+                import_job = (ImportJob.objects
+                              .filter(kind=options['kind'], source=str(path))
+                              .exclude(status='completed')
+                              .order_by('-id')
+                              .first())
+            if import_job is None:
+                import_job = ImportJob.objects.create(kind=options['kind'], source=str(path), created_by=user)
+            else:
+                offset = import_job.offset
+                ImportJob.objects.filter(id=import_job.id).update(status='running')
+                self.stdout.write(f'Resuming import {import_job.id} at offset {offset}')
+
+        def save_progress(report):
+            # Committed batches are final, so the offset after each one is a safe resume point
+            if import_job is not None:
+                ImportJob.objects.filter(id=import_job.id).update(
+                    offset=report['next_offset'],
+                    imported_count=import_job.imported_count + report['imported'],
+                    error_count=import_job.error_count + report['error_count'],
+                )
+
+        importer = IMPORTERS[options['kind']](user)
+        try:
+            with open(path, 'rb') as file:
+                records = READERS[file_format](file, offset=offset)
+                report = run_import(importer, records, offset=offset, batch_size=options['batch_size'],
+                                    dry_run=options['dry_run'], on_batch=save_progress)
+        except Exception:
+            if import_job is not None:
+                ImportJob.objects.filter(id=import_job.id).update(status='failed')
+            raise
+
+        if import_job is not None:
+            ImportJob.objects.filter(id=import_job.id).update(status='completed')
+
+        if options['report']:
+            Path(options['report']).write_text(json.dumps(report, indent=2, default=str))
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {report["imported"]} row(s); {report["error_count"]} row(s) rejected.'))
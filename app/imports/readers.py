@@ -0,0 +1,63 @@
+import csv
+import json
+
+# Readers yield (row_number, start_offset, end_offset, record). Offsets are byte
+# positions for CSV/NDJSON (seekable resume points) and row indexes for JSON arrays.
+# A line that is not valid JSON is yielded as its ValueError so the row can report it.
+
+
+def read_csv(file, offset=0):
+    file.seek(0)
+    header_line = file.readline()
+    header = next(csv.reader([header_line.decode('utf-8-sig')]))
+    if offset:
+        file.seek(offset)
+
+    lines = (line.decode('utf-8') for line in iter(file.readline, b''))
+    reader = csv.reader(lines)
+    row_number = 0
+    start = file.tell()
+    for values in reader:
+        row_number += 1
+        # csv.reader pulls exactly the lines of one record, so tell() is the next record's start
+        end = file.tell()
+        if any(value.strip() for value in values):
+            yield row_number, start, end, dict(zip(header, values))
+        start = end
+
+
+def read_ndjson(file, offset=0):
+    file.seek(offset)
+    row_number = 0
+    start = offset
+    for line in iter(file.readline, b''):
+        end = file.tell()
+        row_number += 1
+        if line.strip():
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                record = e
+            yield row_number, start, end, record
+        start = end
+
+
+def read_json(file, offset=0):
+    file.seek(0)
+    records = json.load(file)
+    if not isinstance(records, list):
+        raise ValueError('JSON imports must be an array of objects.')
+    for index in range(offset, len(records)):
+        yield index + 1, index, index + 1, records[index]
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+    'json': read_json,
+}
+
+
+def guess_format(name):
+    extension = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    return {'jsonl': 'ndjson'}.get(extension, extension)
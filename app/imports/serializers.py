@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+from client.serializers import ClientSerializer
+from job.serializers import JobPostingSerializer
+
+
+# Row-level validation only: no per-row database validators or FK lookups.
+# Uniqueness is checked per batch with one set query (see imports.importers).
+class JobPostingImportSerializer(JobPostingSerializer):
+    class Meta(JobPostingSerializer.Meta):
+        # Extends the parent list so version/type stay read-only on import too
+        read_only_fields = JobPostingSerializer.Meta.read_only_fields + ['posted_by', 'active']
+
+
+class ClientImportSerializer(ClientSerializer):
+    class Meta(ClientSerializer.Meta):
+        extra_kwargs = {'name': {'validators': []}}
+        read_only_fields = getattr(ClientSerializer.Meta, 'read_only_fields', []) + ['active']
+
+
+class ImportRequestSerializer(serializers.Serializer):
+    KIND_CHOICES = ['job_postings', 'clients']
+    FORMAT_CHOICES = ['csv', 'ndjson', 'json']
+
+    kind = serializers.ChoiceField(choices=KIND_CHOICES)
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=FORMAT_CHOICES, required=False)
+    dry_run = serializers.BooleanField(default=False)
+    offset = serializers.IntegerField(min_value=0, default=0)
+    batch_size = serializers.IntegerField(min_value=1, max_value=10000, default=2000)
@@ -0,0 +1,75 @@
+import io
+import json
+
+from django.test import TestCase
+
+from core.models import Client, JobPosting, User
+from imports.importers import ClientImporter, JobPostingImporter, run_import
+from imports.readers import read_ndjson
+from imports.serializers import JobPostingImportSerializer
+from job.tests import job_posting_values
+
+
+def make_user(email='importer@example.com'):
+    return User.objects.create_user(email, 'password', first_name='Import', last_name='User', role='hiring_manager')
+
+
+def ndjson(*records):
+    return io.BytesIO(b''.join(json.dumps(record).encode() + b'\n' for record in records))
+
+
+def client_record(name):
+    return {'name': name, 'email': 'client@example.com', 'contact_number': '09171234567'}
+
+
+class ImportSerializerTests(TestCase):
+    def test_parent_read_only_fields_stay_read_only(self):
+        read_only = JobPostingImportSerializer.Meta.read_only_fields
+        for field in ('type', 'published', 'version', 'posted_by', 'active'):
+            self.assertIn(field, read_only)
+
+
+class NdjsonReaderTests(TestCase):
+    def test_invalid_line_reports_the_parse_error(self):
+        importer = ClientImporter(make_user())
+        file = io.BytesIO(b'{"name": "Acme"\n[1, 2]\n')
+        report = run_import(importer, read_ndjson(file), dry_run=True)
+
+        first, second = report['errors']
+        self.assertEqual(first['row'], 1)
+        self.assertTrue(first['errors']['non_field_errors'][0].startswith('Invalid JSON: Expecting'))
+        self.assertEqual(second['errors'], {'non_field_errors': ['Row is not an object.']})
+
+
+class RacingClientImporter(ClientImporter):
+    # Another request inserts one of the names right after this batch was checked
+    def validate_batch(self, batch):
+        valid, errors = super().validate_batch(batch)
+        Client.objects.create(**client_record('Globex'))
+        return valid, errors
+
+
+class ClientImportRaceTests(TestCase):
+    def test_name_taken_after_validation_is_reported_not_raised(self):
+        importer = RacingClientImporter(make_user())
+        report = run_import(importer, read_ndjson(ndjson(client_record('Acme'), client_record('Globex'))))
+
+        self.assertEqual(report['imported'], 1)
+        [error] = report['errors']
+        self.assertEqual(error['row'], 2)
+        self.assertEqual(error['errors'], {'name': ['client with this name already exists.']})
+        self.assertEqual(Client.objects.filter(name='Globex').count(), 1)
+        self.assertEqual(Client.objects.get(name='Acme').posted_by, importer.user)
+
+
+class JobPostingImportTests(TestCase):
+    def test_imported_postings_are_client_postings(self):
+        importer = JobPostingImporter(make_user())
+        record = job_posting_values(type='prf', target_start_date='2025-01-01')  # type is read-only on import
+        del record['published']
+        report = run_import(importer, read_ndjson(ndjson(record)))
+
+        self.assertEqual(report['imported'], 1, report['errors'])
+        job_posting = JobPosting.objects.get()
+        self.assertEqual(job_posting.type, 'client')
+        self.assertEqual(job_posting.posted_by, importer.user)
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from imports.views import ImportView
+
+urlpatterns = [
+    path('', ImportView.as_view(), name='import-create'),
+]
@@ -0,0 +1,39 @@
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth.permissions import IsHiringManager
+from imports.importers import IMPORTERS, run_import
+from imports.readers import READERS, guess_format
+from imports.serializers import ImportRequestSerializer
+
+
+# Create your views here.
+class ImportView(APIView):
+    permission_classes = [IsHiringManager]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        serializer = ImportRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        upload = data['file']
+        file_format = data.get('format') or guess_format(upload.name)
+        if file_format not in READERS:
+            return Response({'format': ['Could not infer the file format; pass csv, ndjson or json.']},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        importer = IMPORTERS[data['kind']](request.user)
+        try:
+            records = READERS[file_format](upload, offset=data['offset'])
+            report = run_import(importer, records, offset=data['offset'], batch_size=data['batch_size'],
+                                dry_run=data['dry_run'])
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({'file': [f'Could not read file: {e}']}, status=status.HTTP_400_BAD_REQUEST)
+
+        # next_offset can be sent back as `offset` to resume after a partial upload or failure
+        response_status = status.HTTP_200_OK if data['dry_run'] else status.HTTP_201_CREATED
+        return Response(report, status=response_status)
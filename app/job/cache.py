@@ -0,0 +1,99 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, urlencode
+from rest_framework.response import Response
+
+from core.models import JobPosting
+
+_config = getattr(settings, 'JOB_BOARD_CACHE', {})
+cache = caches[_config.get('CACHE', 'default')]
+TIMEOUT = _config.get('TIMEOUT', 300)
+LOCK_TIMEOUT = _config.get('LOCK_TIMEOUT', 10)
+LOCK_WAIT = _config.get('LOCK_WAIT', 2)
+
+VERSION_KEY = 'job_board:version'
+CHANGED_AT_KEY = 'job_board:changed_at'
+
+
+def get_board_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a flushed cache never reuses an old version number
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY, 0)
+    return version
+
+
+def bump_board_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
+    # A hard delete does not move Max(updated_at); Last-Modified also takes the last bump into account
+    cache.set(CHANGED_AT_KEY, int(time.time()), None)
+
+
+def board_last_modified():
+    # Any write touches updated_at (auto_now), so the table-wide max moves with every change
+    return JobPosting.objects.aggregate(last=Max('updated_at'))['last']
+
+
+def _make_entry(key, data, last_modified, etag=None):
+    stamp = last_modified.isoformat() if last_modified else ''
+    timestamps = [int(last_modified.timestamp())] if last_modified else []
+    changed_at = cache.get(CHANGED_AT_KEY)
+    if changed_at is not None:
+        timestamps.append(changed_at)
+    return {
+        'data': data,
+        'etag': etag or '"%s"' % hashlib.sha1(f'{key}:{stamp}'.encode()).hexdigest(),
+        'last_modified': max(timestamps) if timestamps else None,
+    }
+
+
+def _get_or_build(key, build):
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+
+    # Stampede guard: one worker rebuilds, the others wait briefly for its result
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry
+        return _make_entry(key, *build())
+
+    try:
+        entry = _make_entry(key, *build())
+        cache.set(key, entry, TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+    return entry
+
+
+# `build` returns (serialized data, last modified datetime[, etag]) and only runs on a cache miss
+def cached_board_response(request, scope, build):
+    params = urlencode(sorted(request.query_params.lists()), doseq=True)
+    key = 'job_board:%s:%s:%s' % (get_board_version(), scope, hashlib.sha1(params.encode()).hexdigest())
+    entry = _get_or_build(key, build)
+
+    response = Response(entry['data'])
+    response['ETag'] = entry['etag']
+    if entry['last_modified'] is not None:
+        response['Last-Modified'] = http_date(entry['last_modified'])
+
+    return get_conditional_response(
+        request,
+        etag=entry['etag'],
+        last_modified=entry['last_modified'],
+        response=response,
+    ) or response
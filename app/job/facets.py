@@ -0,0 +1,27 @@
+from django.db import connection
+
+FACET_FIELDS = ('status', 'department_name', 'employment_type', 'work_setup', 'type', 'working_site')
+
+
+def facet_counts(queryset):
+    # One GROUPING SETS pass over the filtered postings; GROUPING() tells which set a row belongs to
+    inner_sql, params = queryset.order_by().values(*FACET_FIELDS).query.sql_with_params()
+    columns = ', '.join(connection.ops.quote_name(field) for field in FACET_FIELDS)
+    grouping_sets = ', '.join(f'({connection.ops.quote_name(field)})' for field in FACET_FIELDS)
+    sql = (
+        f'SELECT {columns}, GROUPING({columns}), COUNT(*) '
+        f'FROM ({inner_sql}) AS postings '
+        f'GROUP BY GROUPING SETS ({grouping_sets})'
+    )
+
+    facets = {field: {} for field in FACET_FIELDS}
+    last_bit = len(FACET_FIELDS) - 1
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for row in cursor.fetchall():
+            grouping, count = row[-2], row[-1]
+            for index, field in enumerate(FACET_FIELDS):
+                if not grouping & (1 << (last_bit - index)):
+                    facets[field][row[index]] = count
+                    break
+    return facets
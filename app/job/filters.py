@@ -0,0 +1,31 @@
+from core.models import JobPosting
+from job.search import search_job_postings
+
+
+def is_my_postings(user, params):
+    return user.is_authenticated and params.get('my_postings', 'false').lower() == 'true'
+
+
+# Shared by JobPostingView, the facets endpoint and exports; `params` is any mapping with .get()
+def filter_job_postings(user, params):
+    no_active = params.get('no_active', 'false').lower() == 'true'
+    is_active_param = params.get('is_active', None)
+    is_active = True if is_active_param is None else is_active_param.lower() == 'true'
+    status = params.get('status', None)
+    type = params.get('type', None)
+    search = params.get('q', '').strip()
+
+    if is_my_postings(user, params):
+        qs = JobPosting.objects.filter(posted_by=user, active=is_active)
+        if status:
+            qs = qs.filter(status=status)
+        if no_active:
+            qs = qs.exclude(status='active')
+        if type is not None:
+            qs = qs.filter(type=type)
+    else:
+        qs = JobPosting.objects.filter(status='active', published=True, active=True)
+
+    if search:
+        return search_job_postings(qs, search)
+    return qs.order_by('-created_at', '-id')
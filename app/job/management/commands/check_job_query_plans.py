@@ -0,0 +1,127 @@
+import json
+import random
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.models import JobPosting, User
+from job.views import JobPostingView
+
+# (name, query params, authenticated, plan node types that must not appear on core_jobposting)
+PLAN_CASES = [
+    ('public board', {}, False, {'Seq Scan', 'Sort'}),
+    ('my postings', {'my_postings': 'true'}, True, {'Seq Scan'}),
+    ('my postings by status', {'my_postings': 'true', 'status': 'draft'}, True, {'Seq Scan'}),
+    ('my postings not active, prf only', {'my_postings': 'true', 'no_active': 'true', 'type': 'prf'}, True,
+     {'Seq Scan'}),
+    ('my inactive postings', {'my_postings': 'true', 'is_active': 'false'}, True, {'Seq Scan'}),
+]
+
+
+def _walk(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from _walk(child)
+
+
+def _offending_nodes(plan, forbidden, table):
+    found = []
+    for node in _walk(plan):
+        node_type = node['Node Type']
+        if node_type == 'Seq Scan' and 'Seq Scan' in forbidden and node.get('Relation Name') == table:
+            found.append(node_type)
+        elif node_type in forbidden - {'Seq Scan'}:
+            found.append(node_type)
+    return found
+
+
+class Command(BaseCommand):
+    help = ('Seed job postings in a rolled-back transaction, EXPLAIN each JobPostingView query '
+            'and fail if a sequential scan or sort appears where an index is expected')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--verbose-plans', action='store_true')
+
+    def _seed(self, rows, users):
+        posters = User.objects.bulk_create([
+            User(email=f'plan-check-{i}@example.com', first_name='Plan', last_name=f'Check {i}', password='!')
+            for i in range(users)
+        ])
+        statuses = [choice for choice, _label in JobPosting.STATUS_CHOICES]
+        batch = []
+        for i in range(rows):
+            batch.append(JobPosting(
+                job_title=f'Job {i}',
+                target_start_date=date(2026, 1, 1),
+                reason_for_posting='new',
+                department_name='arm',
+                employment_type='full_time',
+                work_setup='onsite',
+                working_site='HQ',
+                min_salary=Decimal('10000'),
+                max_salary=Decimal('20000'),
+                description='-',
+                responsibilities='-',
+                qualifications='-',
+                status=random.choice(statuses),
+                type=random.choice(['prf', 'client']),
+                active=random.random() < 0.9,
+                published=random.random() < 0.3,
+                posted_by=random.choice(posters),
+            ))
+            if len(batch) == 5000:
+                JobPosting.objects.bulk_create(batch)
+                batch = []
+        JobPosting.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {JobPosting._meta.db_table}')
+        return posters[0]
+
+    def _explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]['Plan']
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        table = JobPosting._meta.db_table
+        failures = []
+
+        with transaction.atomic():
+            user = self._seed(options['rows'], options['users'])
+
+            for name, params, authenticated, forbidden in PLAN_CASES:
+                request = Request(factory.get('/api/job/', params))
+                request.user = user if authenticated else AnonymousUser()
+
+                view = JobPostingView()
+                view.request = request
+                view.format_kwarg = None
+                queryset = view.get_queryset()
+                page_size = view.paginator.get_page_size(request) if view.paginator else 20
+                plan = self._explain(queryset[:page_size])
+
+                offending = _offending_nodes(plan, forbidden, table)
+                if options['verbose_plans']:
+                    self.stdout.write(json.dumps(plan, indent=2))
+                if offending:
+                    failures.append(f'{name}: {", ".join(sorted(set(offending)))}')
+                    self.stdout.write(self.style.ERROR(f'FAIL {name}: {", ".join(sorted(set(offending)))}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'ok   {name}'))
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f'{len(failures)} query plan regression(s): ' + '; '.join(failures))
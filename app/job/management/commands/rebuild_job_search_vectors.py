@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from core.models import JobPosting
+from job.search import refresh_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Recompute JobPosting.search_vector in id-range batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--missing-only', action='store_true')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = JobPosting.objects.order_by('id')
+        if options['missing_only']:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        last_id = 0
+        total = 0
+        while True:
+            ids = list(queryset.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            total += refresh_search_vectors(JobPosting.objects.filter(id__in=ids))
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search vectors for {total} job posting(s).'))
@@ -0,0 +1,43 @@
+import re
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db.models import F
+
+SEARCH_CONFIG = 'english'
+SEARCH_FIELDS = ('job_title', 'department_name', 'description', 'responsibilities', 'qualifications')
+
+# Title outranks department, which outranks the long text body
+SEARCH_VECTOR = (
+    SearchVector('job_title', weight='A', config=SEARCH_CONFIG)
+    + SearchVector('department_name', weight='B', config=SEARCH_CONFIG)
+    + SearchVector('description', 'responsibilities', 'qualifications', weight='C', config=SEARCH_CONFIG)
+)
+
+
+def refresh_search_vectors(queryset):
+    return queryset.update(search_vector=SEARCH_VECTOR)
+
+
+def build_search_query(text):
+    # Every term must match; each term also matches as a prefix ("eng" -> "engineer")
+    terms = re.findall(r'\w+', text)
+    if not terms:
+        return None
+    return SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_job_postings(queryset, text):
+    query = build_search_query(text)
+    if query is None:
+        return queryset.none()
+
+    return (queryset
+            .filter(search_vector=query)
+            .annotate(
+                search_rank=SearchRank(F('search_vector'), query),
+                search_snippet=SearchHeadline(
+                    'description', query, config=SEARCH_CONFIG,
+                    start_sel='<mark>', stop_sel='</mark>', max_words=35, min_words=15,
+                ),
+            )
+            .order_by('-search_rank', '-id'))
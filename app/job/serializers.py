@@ -1,18 +1,108 @@
 from rest_framework import serializers
+
+from core.audit import diff, record_change
+from core.concurrency import (
+    PreconditionFailed, changed_fields, conditional_update, expected_version, supplied_version,
+)
 from core.models import JobPosting
+from job.signals import job_postings_changed
+
+# Named ?fields= projections; None means every field
+FIELD_PRESETS = {
+    'summary': [
+        'id', 'job_title', 'target_start_date', 'reason_for_posting', 'other_reason_for_posting',
+        'department_name', 'employment_type', 'work_setup', 'working_site', 'min_salary', 'max_salary',
+        'status', 'type', 'type_display', 'active', 'published', 'posted_by', 'created_at', 'updated_at',
+    ],
+    'full': None,
+}
+
+# Serializer-only fields and the model columns they read
+FIELD_SOURCES = {
+    'type_display': ['type'],
+}
+
+
+def resolve_field_names(query_params, default_preset='full'):
+    fields = query_params.get('fields')
+    exclude = query_params.get('exclude')
+    preset = query_params.get('preset', default_preset)
+
+    if preset not in FIELD_PRESETS:
+        raise serializers.ValidationError({'preset': f'Unknown preset. Choose from: {", ".join(FIELD_PRESETS)}.'})
+
+    available = list(JobPostingSerializer().fields)
+    if fields:
+        names = [name.strip() for name in fields.split(',') if name.strip()]
+    else:
+        names = FIELD_PRESETS[preset] or available
+
+    if exclude:
+        excluded = {name.strip() for name in exclude.split(',')}
+        names = [name for name in names if name not in excluded]
+
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise serializers.ValidationError({'fields': f'Unknown field(s): {", ".join(unknown)}.'})
+
+    return None if set(names) == set(available) else names
+
+
+def project_queryset(queryset, field_names, always=('id', 'created_at', 'updated_at', 'version')):
+    # Only the columns the projected serializer will read are loaded
+    if field_names is None:
+        return queryset
+
+    model_fields = {field.name for field in JobPosting._meta.concrete_fields}
+    columns = set(always)
+    for name in field_names:
+        columns.update(FIELD_SOURCES.get(name, [name] if name in model_fields else []))
+    return queryset.only(*columns)
+
 
 class JobPostingSerializer(serializers.ModelSerializer):
     type_display = serializers.SerializerMethodField()
 
+    def __init__(self, *args, **kwargs):
+        field_names = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if field_names is not None:
+            for name in set(self.fields) - set(field_names):
+                self.fields.pop(name)
+
     class Meta:
         model = JobPosting
-        fields = '__all__'
-        read_only_fields = ['type', 'published'] # Inorder to set it as 'prf' in PRFSerializer
+        exclude = ['search_vector']
+        read_only_fields = ['type', 'published', 'version'] # Inorder to set it as 'prf' in PRFSerializer
         # Validation comes first before creating, we are already setting it in PRFSerializer create method
 
     def get_type_display(self, obj):
         return obj.get_type_display()
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Present only on ?q= search results
+        if hasattr(instance, 'search_rank'):
+            data['search_rank'] = instance.search_rank
+            data['search_snippet'] = instance.search_snippet
+        return data
+
+    def update(self, instance, validated_data):
+        # Conditional on the version the client read (If-Match or "version"); only changed columns are written
+        expected = expected_version(self.context.get('request'), instance,
+                                    supplied_version(getattr(self, 'initial_data', None)))
+        changes = changed_fields(instance, validated_data)
+        if not changes:
+            if expected != instance.version:
+                raise PreconditionFailed()
+            return instance
+
+        history = diff(instance, changes)
+        conditional_update(instance, expected, changes)
+        job_postings_changed.send(sender=JobPosting, ids=[instance.pk], fields=list(changes))
+        record_change('job_posting', instance.pk, history, getattr(self.context.get('request'), 'user', None))
+        return instance
+
     def destroy(self, instance):
         self.instance.active = False
         self.instance.save()
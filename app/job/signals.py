@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver, Signal
+
+from core.models import JobPosting
+from job.cache import bump_board_version
+from job.search import SEARCH_FIELDS, refresh_search_vectors
+
+# Sent once for set-based writes (queryset.update) that bypass post_save.
+# Receivers get `ids` (list of JobPosting ids) and `fields` (the columns written).
+job_postings_changed = Signal()
+
+
+@receiver(post_save, sender=JobPosting)
+@receiver(post_delete, sender=JobPosting)
+def invalidate_job_board(sender, instance, **kwargs):
+    bump_board_version()
+
+
+@receiver(job_postings_changed, sender=JobPosting)
+def invalidate_job_board_bulk(sender, ids, fields, **kwargs):
+    bump_board_version()
+
+
+@receiver(post_save, sender=JobPosting)
+def update_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    refresh_search_vectors(JobPosting.objects.filter(pk=instance.pk))
+
+
+@receiver(job_postings_changed, sender=JobPosting)
+def update_search_vectors_bulk(sender, ids, fields, **kwargs):
+    if set(fields) & set(SEARCH_FIELDS):
+        refresh_search_vectors(JobPosting.objects.filter(id__in=ids))
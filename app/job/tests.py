@@ -1,3 +1,300 @@
+from datetime import date, timedelta
+
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import Q
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+from core.models import JobPosting, User
+from job.facets import facet_counts
+from job.search import refresh_search_vectors, search_job_postings
+
+
+def job_posting_values(**fields):
+    values = {
+        'job_title': 'Sales Associate',
+        'target_start_date': date(2025, 1, 1),
+        'reason_for_posting': 'new_position',
+        'department_name': 'sales-operations',
+        'employment_type': 'full_time',
+        'work_setup': 'onsite',
+        'working_site': 'Makati',
+        'min_salary': 20000,
+        'max_salary': 30000,
+        'description': 'Sell things.',
+        'responsibilities': 'Selling.',
+        'qualifications': 'Can sell.',
+        'status': 'active',
+        'type': 'client',
+        'published': True,
+    }
+    values.update(fields)
+    return values
+
+
+def make_job_posting(**fields):
+    return JobPosting.objects.create(**job_posting_values(**fields))
+
+
+def make_hiring_manager(email='manager@example.com'):
+    return User.objects.create_user(email, 'password', first_name='Hiring', last_name='Manager',
+                                    role='hiring_manager')
+
+
+class JobBoardCacheTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.client = APIClient()
+
+    def test_hard_delete_moves_last_modified(self):
+        older = make_job_posting(job_title='Older')
+        newer = make_job_posting(job_title='Newer')
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        JobPosting.objects.filter(id=older.id).update(updated_at=an_hour_ago - timedelta(minutes=5))
+        JobPosting.objects.filter(id=newer.id).update(updated_at=an_hour_ago)
+        caches['default'].clear()
+
+        first = self.client.get('/api/job/')
+        self.assertEqual(first['Last-Modified'], http_date(int(an_hour_ago.timestamp())))
+
+        # Max(updated_at) falls back to the older row, but the board did change
+        newer.delete()
+        second = self.client.get('/api/job/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+    def test_unchanged_board_answers_304(self):
+        make_job_posting()
+        first = self.client.get('/api/job/')
+        second = self.client.get('/api/job/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+
+
+class KeysetPaginationTests(TestCase):
+    ROWS = 3000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_hiring_manager()
+        JobPosting.objects.bulk_create([
+            JobPosting(**job_posting_values(job_title=f'Posting {index}', posted_by=cls.user))
+            for index in range(cls.ROWS)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries]
+
+    def test_deep_cursor_page_costs_the_same_as_the_first(self):
+        response = self.client.get('/api/job/?my_postings=true&pagination=cursor&page_size=100')
+        seen, deep_link = len(response.data['results']), None
+        while response.data['next']:
+            deep_link = response.data['next']
+            response = self.client.get(deep_link)
+            seen += len(response.data['results'])
+        self.assertEqual(seen, self.ROWS)
+
+        # Same page size as the offset pages below
+        page_size = api_settings.PAGE_SIZE
+        first_sql = self._queries(f'/api/job/?my_postings=true&pagination=cursor&page_size={page_size}')
+        deep_sql = self._queries(deep_link.replace('page_size=100', f'page_size={page_size}'))
+
+        # Keyset pages never count and never skip rows with OFFSET
+        self.assertEqual(len(deep_sql), len(first_sql))
+        for sql in first_sql + deep_sql:
+            self.assertNotIn('COUNT(', sql.upper())
+            self.assertNotIn('OFFSET', sql.upper())
+
+        # Offset pagination counts the table and skips every earlier row on deep pages
+        offset_sql = self._queries(f'/api/job/?my_postings=true&page={self.ROWS // page_size - 1}')
+        self.assertTrue(any('COUNT(' in sql.upper() for sql in offset_sql))
+        self.assertTrue(any('OFFSET' in sql.upper() for sql in offset_sql))
+
+
+class JobSearchTests(TestCase):
+    ROWS = 2000
+
+    @classmethod
+    def setUpTestData(cls):
+        JobPosting.objects.bulk_create([
+            JobPosting(**job_posting_values(job_title=f'Sales Associate {index}',
+                                            description=f'Sell things in branch {index}.'))
+            for index in range(cls.ROWS)
+        ])
+        cls.title_match = make_job_posting(job_title='Data Engineer', description='Build pipelines.')
+        cls.body_match = make_job_posting(job_title='Analyst', description='Works with the engineering team.')
+        refresh_search_vectors(JobPosting.objects.all())
+
+    def test_title_match_outranks_body_match(self):
+        response = APIClient().get('/api/job/?q=engineer')
+        self.assertEqual(response.status_code, 200)
+        ids = [row['id'] for row in response.data['results']]
+        self.assertEqual(ids, [self.title_match.id, self.body_match.id])
+
+    def test_cursor_pagination_is_rejected_for_ranked_search(self):
+        response = APIClient().get('/api/job/?q=engineer&pagination=cursor')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('pagination', response.data)
+
+    def test_search_finds_what_icontains_finds_through_the_index(self):
+        queryset = JobPosting.objects.filter(status='active', published=True, active=True)
+        search = search_job_postings(queryset, 'engineer')
+        matches = Q()
+        for field in ('job_title', 'department_name', 'description', 'responsibilities', 'qualifications'):
+            matches |= Q(**{f'{field}__icontains': 'engineer'})
+
+        ranked = list(search.values_list('id', flat=True))
+        self.assertEqual(set(ranked), set(queryset.filter(matches).values_list('id', flat=True)))
+        self.assertEqual(ranked[0], self.title_match.id)
+
+        # The match itself is answerable from the GIN index, unlike the icontains scan
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        self.assertIn('job_search_vector_idx', search_job_postings(JobPosting.objects.all(), 'engineer').explain())
+
+
+class BulkDeleteTests(TestCase):
+    def setUp(self):
+        self.user = make_hiring_manager()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_duplicate_ids_in_one_chunk_are_reported_once(self):
+        posting = make_job_posting(posted_by=self.user)
+        response = self.client.delete('/api/job/bulk-delete/', {'ids': [posting.id, posting.id, 999999, 999999]},
+                                      format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'updated': [posting.id], 'not_found': [999999], 'not_owned': []})
+
+    def test_streamed_duplicates_are_reported_once(self):
+        posting = make_job_posting(posted_by=self.user)
+        response = self.client.generic('DELETE', '/api/job/bulk-delete/', f'{posting.id}, {posting.id}\n{posting.id}',
+                                       content_type='text/plain')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], [posting.id])
+
+    def test_non_integer_ids_are_rejected(self):
+        posting = make_job_posting(posted_by=self.user)
+        for ids in ([posting.id + 0.5], [f'{posting.id}.5'], [True], [None], [[posting.id]]):
+            response = self.client.delete('/api/job/bulk-delete/', {'ids': ids}, format='json')
+            self.assertEqual(response.status_code, 400, ids)
+        response = self.client.generic('DELETE', '/api/job/bulk-delete/', f'{posting.id}.5', content_type='text/plain')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(JobPosting.objects.get(id=posting.id).active)
+
+
+class FieldProjectionTests(TestCase):
+    ROWS = 50
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_hiring_manager()
+        JobPosting.objects.bulk_create([
+            JobPosting(**job_posting_values(posted_by=cls.user, description='Long description. ' * 300))
+            for _ in range(cls.ROWS)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _list(self, query):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/job/?my_postings=true&pagination=cursor&page_size=50{query}')
+        self.assertEqual(response.status_code, 200)
+        select = next(q['sql'] for q in queries if 'FROM "core_jobposting"' in q['sql'])
+        return response, select
+
+    def test_summary_preset_neither_loads_nor_ships_long_text(self):
+        summary, summary_sql = self._list('')
+        full, full_sql = self._list('&preset=full')
+
+        for column in ('"description"', '"responsibilities"', '"qualifications"', '"search_vector"'):
+            self.assertNotIn(column, summary_sql)
+        self.assertIn('"description"', full_sql)
+        self.assertNotIn('description', summary.data['results'][0])
+        self.assertIn('description', full.data['results'][0])
+
+        self.assertLess(len(summary.content) * 5, len(full.content))
+
+    def test_explicit_fields_load_only_their_columns(self):
+        response, sql = self._list('&fields=id,job_title,type_display')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'job_title', 'type_display'})
+        self.assertIn('"type"', sql)
+        self.assertNotIn('"working_site"', sql)
+
+
+class JobPostingUpdateTests(TestCase):
+    def setUp(self):
+        self.user = make_hiring_manager()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.posting = make_job_posting(posted_by=self.user)
+        self.url = f'/api/job/{self.posting.id}/'
+
+    def test_update_needs_the_version_it_was_based_on(self):
+        self.assertEqual(self.client.patch(self.url, {'job_title': 'Lead'}, format='json').status_code, 428)
+
+        response = self.client.patch(self.url, {'job_title': 'Lead'}, format='json', HTTP_IF_MATCH=f'"{self.posting.id}-1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], f'"{self.posting.id}-2"')
+
+        # A second editor who read version 1 is refused instead of overwriting
+        response = self.client.patch(self.url, {'job_title': 'Head', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(JobPosting.objects.get(id=self.posting.id).job_title, 'Lead')
+
+
+class JobPostingFacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_hiring_manager()
+        make_job_posting(posted_by=cls.user, department_name='sales', work_setup='remote')
+        make_job_posting(posted_by=cls.user, department_name='sales', work_setup='onsite')
+        make_job_posting(posted_by=cls.user, department_name='finance', work_setup='remote', employment_type='part_time')
+        # Not on the public board
+        make_job_posting(posted_by=cls.user, department_name='finance', status='closed')
+        make_job_posting(posted_by=cls.user, department_name='legal', published=False)
+
+    def setUp(self):
+        caches['default'].clear()
+        self.client = APIClient()
+
+    def test_counts_per_facet(self):
+        response = self.client.get('/api/job/facets/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], {'active': 3})
+        self.assertEqual(response.data['department_name'], {'sales': 2, 'finance': 1})
+        self.assertEqual(response.data['work_setup'], {'remote': 2, 'onsite': 1})
+        self.assertEqual(response.data['employment_type'], {'full_time': 2, 'part_time': 1})
+        self.assertEqual(response.data['type'], {'client': 3})
+        self.assertEqual(response.data['working_site'], {'Makati': 3})
+
+    def test_filters_apply_before_counting(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/job/facets/?my_postings=true')
+        self.assertEqual(response.data['status'], {'active': 4, 'closed': 1})
+        self.assertEqual(response.data['department_name'], {'sales': 2, 'finance': 2, 'legal': 1})
+
+        response = self.client.get('/api/job/facets/?my_postings=true&status=closed')
+        self.assertEqual(response.data['status'], {'closed': 1})
+        self.assertEqual(response.data['department_name'], {'finance': 1})
+
+        response = self.client.get('/api/job/facets/?my_postings=true&q=nothingmatches')
+        self.assertEqual(response.data['department_name'], {})
 
-# Create your tests here.
+    def test_all_facets_come_from_one_query(self):
+        with self.assertNumQueries(1):
+            facets = facet_counts(JobPosting.objects.filter(posted_by=self.user))
+        self.assertEqual(sum(facets['status'].values()), 5)
@@ -1,9 +1,12 @@
 from django.urls import path
 #
-from job.views import JobPostingView, JobPostingViewDelete, JobPostingDetailView
+from core.views import ChangeHistoryView
+from job.views import JobPostingView, JobPostingViewDelete, JobPostingDetailView, JobPostingFacetsView
 
 urlpatterns = [
     path('', JobPostingView.as_view(), name='position-list'),
+    path('facets/', JobPostingFacetsView.as_view(), name='position-facets'),
     path('<int:pk>/', JobPostingDetailView.as_view(), name='position-details'),
     path('bulk-delete/', JobPostingViewDelete.as_view(), name='position-bulk-delete'),
+    path('<int:pk>/history/', ChangeHistoryView.as_view(object_type='job_posting'), name='position-history'),
 ]
\ No newline at end of file
@@ -1,39 +1,124 @@
-from rest_framework import status
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers, status
 from rest_framework.generics import ListAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
 from auth.permissions import IsHiringManager
+from core.concurrency import VersionETagMixin, etag_for
 from core.models import JobPosting
-from job.serializers import JobPostingSerializer
+from core.pagination import KeysetPagination, is_cursor_mode
+from job.cache import cached_board_response, board_last_modified
+from job.facets import facet_counts
+from job.filters import filter_job_postings, is_my_postings
+from job.serializers import JobPostingSerializer, resolve_field_names, project_queryset
+from job.signals import job_postings_changed
+
+
+BULK_DELETE_CHUNK_SIZE = 1000
+
+
+def _parse_id(job_id):
+    # int() would quietly truncate 1.5 to 1; only whole numbers and their string forms pass
+    if isinstance(job_id, bool) or not isinstance(job_id, (int, str, bytes)):
+        raise TypeError('Job Posting IDs must be integers')
+    return int(job_id)
+
+
+def _chunked(ids, size):
+    chunk = []
+    for job_id in ids:
+        chunk.append(_parse_id(job_id))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_streamed_ids(stream, read_size=65536):
+    pending = b''
+    while True:
+        block = stream.read(read_size) if stream is not None else b''
+        if not block:
+            break
+        tokens = (pending + block).replace(b',', b' ').split()
+        # The last token may continue in the next block
+        pending = tokens.pop() if tokens and not block[-1:].isspace() and block[-1:] != b',' else b''
+        yield from tokens
+    if pending:
+        yield pending
+
+
+class JobPostingFieldsMixin:
+    # ?fields=, ?exclude= and ?preset= pick the serialized fields and the loaded columns on reads
+    default_field_preset = 'full'
+
+    def get_field_names(self):
+        if self.request.method != 'GET':
+            return None
+        if not hasattr(self, '_field_names'):
+            self._field_names = resolve_field_names(self.request.query_params, self.default_field_preset)
+        return self._field_names
+
+    def get_serializer(self, *args, **kwargs):
+        field_names = self.get_field_names()
+        if field_names is not None:
+            kwargs['fields'] = field_names
+        return super().get_serializer(*args, **kwargs)
+
+    def project(self, queryset):
+        return project_queryset(queryset, self.get_field_names())
 
 
 # Create your views here.
-class JobPostingView(ListAPIView):
+class JobPostingView(JobPostingFieldsMixin, ListAPIView):
     permission_classes = [AllowAny]
     serializer_class = JobPostingSerializer
+    default_field_preset = 'summary'
+
+    @property
+    def pagination_class(self):
+        request = getattr(self, 'request', None)
+        if request is not None and is_cursor_mode(request):
+            return KeysetPagination
+        return api_settings.DEFAULT_PAGINATION_CLASS
+
+    def is_my_postings(self):
+        return is_my_postings(self.request.user, self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        if is_cursor_mode(request) and request.query_params.get('q', '').strip():
+            # Cursor positions follow (created_at, id) and would throw away the rank ordering
+            raise serializers.ValidationError(
+                {'pagination': 'Cursor pagination is not available with ?q=; use page numbers for search results.'})
+
+        if self.is_my_postings():
+            return super().list(request, *args, **kwargs)
+
+        # Public board: served from the versioned cache, 304 when the client copy is current
+        parent_list = super().list
+        return cached_board_response(request, 'list', lambda: (
+            parent_list(request, *args, **kwargs).data,
+            board_last_modified(),
+        ))
 
     def get_queryset(self):
-        user = self.request.user
-        my_postings = self.request.query_params.get('my_postings', 'false').lower() == 'true'
-        no_active = self.request.query_params.get('no_active', 'false').lower() == 'true'
-        is_active_param = self.request.query_params.get('is_active', None)
-        is_active = True if is_active_param is None else is_active_param.lower() == 'true'
-        status = self.request.query_params.get('status', None)
-        type = self.request.query_params.get('type', None)
-
-        if user.is_authenticated and my_postings:
-            qs = JobPosting.objects.filter(posted_by=user, active=is_active)
-            if status:
-                qs = qs.filter(status=status)
-            if no_active:
-                qs = qs.exclude(status='active')
-            if type is not None:
-                qs = qs.filter(type=type)
-            return qs
-
-        return JobPosting.objects.filter(status='active', published=True, active=True)
+        return self.project(filter_job_postings(self.request.user, self.request.query_params))
+
+
+class JobPostingFacetsView(JobPostingView):
+    # Same filters as the list view; counts per facet from a single grouped query
+
+    def get(self, request, *args, **kwargs):
+        scope = f'facets:{request.user.id}' if self.is_my_postings() else 'facets:public'
+        return cached_board_response(request, scope, lambda: (
+            facet_counts(self.get_queryset()),
+            board_last_modified(),
+        ))
 
 
 class JobPostingViewDelete(APIView):
@@ -45,18 +130,53 @@ class JobPostingViewDelete(APIView):
         return JobPosting.objects.filter(posted_by=user)
 
     def delete(self, request):
-        ids = request.data.pop('ids', None)
-
-        if isinstance(ids, list):
-            job_postings = self.get_queryset().filter(id__in=ids)
-            for job_posting in job_postings:
-                serializer = self.serializer_class(job_posting)
-                serializer.destroy(serializer.context.get('request', request))
-            return Response(status=status.HTTP_204_NO_CONTENT)
-
-        return Response({'error': 'Invalid data. "ids" should be a list of Job Posting IDs.'}, status=status.HTTP_400_BAD_REQUEST)
-
-class JobPostingDetailView(RetrieveUpdateDestroyAPIView):
+        if request.content_type.startswith('text/plain'):
+            # Large lists: whitespace/comma separated ids read from the body as it streams in
+            ids = _iter_streamed_ids(request.stream)
+        else:
+            ids = request.data.get('ids', None)
+            if not isinstance(ids, list):
+                return Response({'error': 'Invalid data. "ids" should be a list of Job Posting IDs.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        updated, not_found, not_owned = [], [], []
+        now = timezone.now()
+        seen = set()
+
+        try:
+            with transaction.atomic():
+                for chunk in _chunked(ids, BULK_DELETE_CHUNK_SIZE):
+                    # dict.fromkeys drops repeats inside the chunk as well, keeping first-seen order
+                    chunk = [job_id for job_id in dict.fromkeys(chunk) if job_id not in seen]
+                    seen.update(chunk)
+
+                    owners = dict(JobPosting.objects.filter(id__in=chunk).values_list('id', 'posted_by_id'))
+                    owned = []
+                    for job_id in chunk:
+                        if job_id not in owners:
+                            not_found.append(job_id)
+                        elif owners[job_id] != request.user.id:
+                            not_owned.append(job_id)
+                        else:
+                            owned.append(job_id)
+
+                    if owned:
+                        self.get_queryset().filter(id__in=owned).update(active=False, updated_at=now)
+                        updated.extend(owned)
+        except (TypeError, ValueError):
+            return Response({'error': 'Invalid data. "ids" should be a list of Job Posting IDs.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if updated:
+            job_postings_changed.send(sender=JobPosting, ids=updated, fields=['active', 'updated_at'])
+
+        return Response({
+            'updated': updated,
+            'not_found': not_found,
+            'not_owned': not_owned,
+        }, status=status.HTTP_200_OK)
+
+class JobPostingDetailView(VersionETagMixin, JobPostingFieldsMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = JobPostingSerializer
     lookup_field = 'pk'
 
@@ -67,10 +187,17 @@ class JobPostingDetailView(RetrieveUpdateDestroyAPIView):
             self.permission_classes = [AllowAny]
         return super().get_permissions()
 
+    def retrieve(self, request, *args, **kwargs):
+        def build():
+            instance = self.get_object()
+            return self.get_serializer(instance).data, instance.updated_at, etag_for(instance)
+
+        return cached_board_response(request, f'detail:{kwargs[self.lookup_field]}', build)
+
     def get_queryset(self):
         # user = self.request.user
         # if user.is_authenticated:
         #     return JobPosting.objects.filter(posted_by=user)
 
-        return JobPosting.objects.filter(status='active', published=True, active=True)
+        return self.project(JobPosting.objects.filter(status='active', published=True, active=True))
 
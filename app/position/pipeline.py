@@ -0,0 +1,52 @@
+from django.db import connection, transaction
+
+from core.models import Position, PipelineStep
+
+STAGES = {stage for stage, _label in PipelineStep.STAGE_CHOICES}
+
+
+class ReorderError(ValueError):
+    pass
+
+
+# `steps` is the complete desired layout: [{'id': ..., 'stage': ..., 'order': ...}, ...].
+# One locked read and one UPDATE ... FROM (VALUES ...) whatever the number of steps; the
+# unique constraint is DEFERRABLE, so swaps within the statement do not trip it.
+@transaction.atomic
+def reorder_pipeline(position_id, steps):
+    # Row lock on the position serializes concurrent reorders of the same pipeline
+    Position.objects.select_for_update().only('id').get(pk=position_id)
+    existing = set(PipelineStep.objects.filter(position_id=position_id).values_list('id', flat=True))
+
+    ids = [step['id'] for step in steps]
+    if len(set(ids)) != len(ids):
+        raise ReorderError('Each step may appear only once.')
+    if set(ids) != existing:
+        raise ReorderError('The new order must list every step of this position and no others.')
+
+    seen = set()
+    for step in steps:
+        if step['stage'] not in STAGES:
+            raise ReorderError(f'Stage {step["stage"]} is not one of {sorted(STAGES)}.')
+        if step['order'] < 1:
+            raise ReorderError('Order values start at 1.')
+        key = (step['stage'], step['order'])
+        if key in seen:
+            raise ReorderError(f'Stage {key[0]} has more than one step with order {key[1]}.')
+        seen.add(key)
+
+    if not steps:
+        return 0
+
+    quote = connection.ops.quote_name
+    values = ', '.join(['(%s::bigint, %s::integer, %s::integer)'] * len(steps))
+    params = [value for step in steps for value in (step['id'], step['stage'], step['order'])]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {quote(PipelineStep._meta.db_table)} AS step '
+            f'SET {quote("stage")} = new.stage, {quote("order")} = new.step_order '
+            f'FROM (VALUES {values}) AS new (id, stage, step_order) '
+            f'WHERE step.id = new.id AND step.position_id = %s',
+            [*params, position_id],
+        )
+        return cursor.rowcount
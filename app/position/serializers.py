@@ -0,0 +1,79 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from core.models import Position, PipelineStep, ApplicationForm, JobPosting
+from job.serializers import JobPostingSerializer
+
+PIPELINE_STEP_FIELDS = ['process_type', 'process_title', 'description', 'stage', 'order']
+APPLICATION_FORM_FIELDS = [field.name for field in ApplicationForm._meta.concrete_fields
+                           if field.name not in ('id', 'position')]
+
+
+class PipelineStepSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PipelineStep
+        fields = ['id', *PIPELINE_STEP_FIELDS]
+
+
+class ApplicationFormSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ApplicationForm
+        fields = ['id', *APPLICATION_FORM_FIELDS]
+
+
+class PositionSerializer(serializers.ModelSerializer):
+    job_posting = JobPostingSerializer()
+    pipeline = PipelineStepSerializer(many=True, required=False)
+    application_form = ApplicationFormSerializer(required=False)
+    # Copy the pipeline and application form of an existing position when they are not sent
+    template = serializers.PrimaryKeyRelatedField(queryset=Position.objects.all(), write_only=True, required=False)
+
+    class Meta:
+        model = Position
+        fields = ['id', 'client', 'education_level', 'experience_level', 'job_posting', 'pipeline',
+                  'application_form', 'template']
+
+    def validate_pipeline(self, steps):
+        seen = set()
+        for step in steps:
+            key = (step['stage'], step['order'])
+            if key in seen:
+                raise serializers.ValidationError(f'Stage {key[0]} has more than one step with order {key[1]}.')
+            seen.add(key)
+        return steps
+
+    @transaction.atomic
+    def create(self, validated_data):
+        job_posting_data = validated_data.pop('job_posting')
+        template = validated_data.pop('template', None)
+        pipeline_data = validated_data.pop('pipeline', None)
+        application_form_data = validated_data.pop('application_form', None)
+
+        if template is not None:
+            # Two reads for the whole template, whatever the pipeline length
+            if pipeline_data is None:
+                pipeline_data = list(template.pipeline.order_by('stage', 'order').values(*PIPELINE_STEP_FIELDS))
+            if application_form_data is None:
+                application_form_data = ApplicationForm.objects.filter(position=template) \
+                    .values(*APPLICATION_FORM_FIELDS).first()
+
+        job_posting_data['posted_by'] = self.context['request'].user
+        job_posting_data['type'] = 'client'
+        job_posting = JobPosting.objects.create(**job_posting_data)
+        position = Position.objects.create(job_posting=job_posting, **validated_data)
+
+        # One INSERT for every step of every stage
+        PipelineStep.objects.bulk_create([PipelineStep(position=position, **step) for step in pipeline_data or []])
+        ApplicationForm.objects.create(position=position, **(application_form_data or {}))
+
+        return position
+
+
+class PipelineStepOrderSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    stage = serializers.ChoiceField(choices=PipelineStep.STAGE_CHOICES)
+    order = serializers.IntegerField(min_value=1)
+
+
+class PipelineReorderSerializer(serializers.Serializer):
+    steps = PipelineStepOrderSerializer(many=True, allow_empty=True)
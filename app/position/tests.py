@@ -0,0 +1,239 @@
+import threading
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from client.tests import make_clients
+from core.models import ApplicationForm, PipelineStep, Position
+from job.tests import job_posting_values, make_hiring_manager, make_job_posting
+from position.pipeline import ReorderError, reorder_pipeline
+from position.serializers import APPLICATION_FORM_FIELDS, PIPELINE_STEP_FIELDS
+
+
+# `count` steps spread over the four stages: stage 1 gets orders 1, 2, ..., then stage 2, and so on
+def pipeline(count):
+    return [{'process_type': 'initial_interview', 'process_title': f'Step {index}', 'description': '',
+             'stage': index % 4 + 1, 'order': index // 4 + 1} for index in range(count)]
+
+
+def position_payload(client, **fields):
+    job_posting = job_posting_values(target_start_date='2025-01-01')
+    for read_only in ('type', 'published'):
+        job_posting.pop(read_only)
+    payload = {'client': client.id, 'education_level': 'bachelor', 'experience_level': 'mid',
+               'job_posting': job_posting}
+    payload.update(fields)
+    return payload
+
+
+def make_position(steps):
+    position = Position.objects.create(job_posting=make_job_posting(), education_level='bachelor',
+                                       experience_level='mid')
+    PipelineStep.objects.bulk_create([PipelineStep(position=position, **step) for step in pipeline(steps)])
+    return position
+
+
+# The current layout as the reorder payload: [{'id', 'stage', 'order'}, ...]
+def layout(position_id):
+    return list(PipelineStep.objects.filter(position_id=position_id).order_by('stage', 'order')
+                .values('id', 'stage', 'order'))
+
+
+def stored_pipeline(position_id):
+    return list(PipelineStep.objects.filter(position_id=position_id).order_by('stage', 'order')
+                .values(*PIPELINE_STEP_FIELDS))
+
+
+def stored_form(position_id):
+    return ApplicationForm.objects.filter(position_id=position_id).values(*APPLICATION_FORM_FIELDS).get()
+
+
+class PositionCreateTests(TestCase):
+    def setUp(self):
+        self.user = make_hiring_manager()
+        self.position_client = make_clients(1, posted_by=self.user)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _create(self, **fields):
+        response = self.client.post('/api/position/', position_payload(self.position_client, **fields), format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['id']
+
+    def test_statement_count_does_not_grow_with_the_pipeline(self):
+        with CaptureQueriesContext(connection) as single:
+            self._create(pipeline=pipeline(1))
+        # Four stages of three steps each are still one INSERT
+        with self.assertNumQueries(len(single)):
+            position_id = self._create(pipeline=pipeline(12))
+
+        steps = stored_pipeline(position_id)
+        self.assertEqual(len(steps), 12)
+        self.assertEqual([(step['stage'], step['order']) for step in steps],
+                         [(stage, order) for stage in range(1, 5) for order in range(1, 4)])
+        self.assertEqual(Position.objects.get(id=position_id).job_posting.type, 'client')
+
+    def test_template_pipeline_and_form_are_copied(self):
+        template_id = self._create(pipeline=pipeline(12),
+                                   application_form={'gender': 'required', 'photo_2x2': 'disabled'})
+        position_id = self._create(template=template_id)
+
+        self.assertEqual(stored_pipeline(position_id), stored_pipeline(template_id))
+        self.assertEqual(stored_form(position_id), stored_form(template_id))
+        self.assertEqual(stored_form(position_id)['gender'], 'required')
+        # Copies, not shared rows
+        self.assertEqual(PipelineStep.objects.filter(position_id=template_id).count(), 12)
+        self.assertEqual(PipelineStep.objects.filter(position_id=position_id).count(), 12)
+
+    def test_template_cost_does_not_grow_with_its_pipeline(self):
+        small = self._create(pipeline=pipeline(1))
+        large = self._create(pipeline=pipeline(12))
+        with CaptureQueriesContext(connection) as single:
+            self._create(template=small)
+        with self.assertNumQueries(len(single)):
+            self._create(template=large)
+
+    def test_sent_parts_override_the_template(self):
+        template_id = self._create(pipeline=pipeline(12), application_form={'gender': 'required'})
+        position_id = self._create(template=template_id, pipeline=pipeline(2))
+
+        self.assertEqual(len(stored_pipeline(position_id)), 2)
+        self.assertEqual(stored_form(position_id)['gender'], 'required')
+
+    def test_duplicate_stage_order_is_a_400(self):
+        steps = pipeline(2)
+        steps[1].update(stage=1, order=1)
+        response = self.client.post('/api/position/', position_payload(self.position_client, pipeline=steps),
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('pipeline', response.data)
+        self.assertFalse(Position.objects.exists())
+
+
+class PipelineReorderTests(TestCase):
+    def setUp(self):
+        self.user = make_hiring_manager()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.position = make_position(8)
+        self.url = f'/api/position/{self.position.id}/pipeline/reorder/'
+
+    # Statements sent by reorder_pipeline, without the savepoint its atomic block opens inside the test transaction
+    def _reorder(self, steps):
+        with CaptureQueriesContext(connection) as queries:
+            updated = reorder_pipeline(self.position.id, steps)
+        statements = [query['sql'] for query in queries if 'SAVEPOINT' not in query['sql']]
+        return updated, statements
+
+    def test_swap_is_one_update(self):
+        steps = layout(self.position.id)
+        first, second = steps[0], steps[1]  # Stage 1, orders 1 and 2
+        first['order'], second['order'] = 2, 1
+
+        # Lock, read, UPDATE: the deferrable unique constraint lets the swap happen in one statement
+        updated, statements = self._reorder(steps)
+        self.assertEqual(updated, 8)
+        self.assertEqual(len(statements), 3, statements)
+        self.assertTrue(statements[2].startswith('UPDATE'))
+        orders = dict(PipelineStep.objects.filter(position=self.position).values_list('id', 'order'))
+        self.assertEqual((orders[first['id']], orders[second['id']]), (2, 1))
+
+    def test_moving_every_step_is_still_one_update(self):
+        steps = layout(self.position.id)
+        # Every step moves to the next stage, so each target slot is held by another step until the end
+        moved = [{**step, 'stage': step['stage'] % 4 + 1} for step in steps]
+        _updated, statements = self._reorder(moved)
+        self.assertEqual(len(statements), 3, statements)
+        self.assertEqual(sorted(layout(self.position.id), key=lambda step: step['id']),
+                         sorted(moved, key=lambda step: step['id']))
+
+    def test_view_returns_the_new_order(self):
+        steps = layout(self.position.id)
+        steps[0]['stage'], steps[-1]['stage'] = steps[-1]['stage'], steps[0]['stage']
+        steps[0]['order'], steps[-1]['order'] = steps[-1]['order'], steps[0]['order']
+        response = self.client.post(self.url, {'steps': steps}, format='json')
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([step['id'] for step in response.data], [step['id'] for step in layout(self.position.id)])
+        self.assertEqual(response.data[-1]['id'], steps[0]['id'])
+
+    def test_invalid_orderings_are_rejected_and_change_nothing(self):
+        other_step = make_position(1).pipeline.get()
+        steps = layout(self.position.id)
+        before = list(steps)
+
+        unknown = steps[:-1] + [{'id': other_step.id, 'stage': 4, 'order': 9}]
+        duplicate_id = steps[:-1] + [{**steps[0], 'stage': 4, 'order': 9}]
+        incomplete = steps[:-1]
+        duplicate_slot = steps[:-1] + [{**steps[-1], 'stage': steps[0]['stage'], 'order': steps[0]['order']}]
+        for payload in (unknown, duplicate_id, incomplete, duplicate_slot):
+            with self.assertRaises(ReorderError):
+                reorder_pipeline(self.position.id, payload)
+            response = self.client.post(self.url, {'steps': payload}, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('steps', response.data)
+
+        response = self.client.post(self.url, {'steps': steps[:-1] + [{**steps[-1], 'stage': 5}]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(layout(self.position.id), before)
+        self.assertEqual(other_step.position.pipeline.get().order, 1)
+
+    def test_unknown_position_is_a_404_and_staff_cannot_reorder(self):
+        response = self.client.post('/api/position/0/pipeline/reorder/', {'steps': []}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+        staff = self.user.__class__.objects.create_user('staff@example.com', 'password', first_name='Staff',
+                                                        last_name='User', role='manager')
+        self.client.force_authenticate(staff)
+        response = self.client.post(self.url, {'steps': layout(self.position.id)}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class PipelineConcurrentReorderTests(TransactionTestCase):
+    def test_reorders_of_one_pipeline_run_one_after_the_other(self):
+        position = make_position(8)
+        steps = layout(position.id)
+        reversed_orders = [{**step, 'order': 3 - step['order']} for step in steps]  # Orders 1 and 2 swap
+        next_stage = [{**step, 'stage': step['stage'] % 4 + 1} for step in steps]
+        first_locked, release, second_done = threading.Event(), threading.Event(), threading.Event()
+        errors = []
+
+        def first():
+            try:
+                with transaction.atomic():
+                    reorder_pipeline(position.id, reversed_orders)
+                    first_locked.set()
+                    release.wait(10)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                first_locked.set()
+                connection.close()
+
+        def second():
+            try:
+                first_locked.wait(10)
+                reorder_pipeline(position.id, next_stage)
+                second_done.set()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=first), threading.Thread(target=second)]
+        for thread in threads:
+            thread.start()
+        first_locked.wait(10)
+        # The second reorder cannot apply its layout while the first transaction is still open
+        self.assertFalse(second_done.wait(0.5))
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertTrue(second_done.is_set())
+        # The second layout was applied whole on top of the first, not interleaved with it
+        self.assertEqual(sorted(layout(position.id), key=lambda step: step['id']),
+                         sorted(next_stage, key=lambda step: step['id']))
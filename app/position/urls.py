@@ -0,0 +1,9 @@
+from django.urls import path
+
+from position.views import PositionListCreateView, PositionDetailView, PipelineReorderView
+
+urlpatterns = [
+    path('', PositionListCreateView.as_view(), name='client-position-list'),
+    path('<int:pk>/', PositionDetailView.as_view(), name='client-position-detail'),
+    path('<int:pk>/pipeline/reorder/', PipelineReorderView.as_view(), name='client-position-pipeline-reorder'),
+]
@@ -0,0 +1,69 @@
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import ListCreateAPIView, RetrieveAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth.permissions import IsHiringManager
+from core.models import Position, PipelineStep
+from core.pagination import IdKeysetPagination
+from position.pipeline import ReorderError, reorder_pipeline
+from position.serializers import PositionSerializer, PipelineReorderSerializer, PipelineStepSerializer
+
+
+# Everything PositionSerializer reads in two queries: positions with their joined one-to-ones,
+# then all pipeline steps for the page
+def with_read_relations(queryset):
+    return (queryset
+            .select_related('job_posting', 'application_form')
+            .defer('job_posting__search_vector')
+            .prefetch_related(Prefetch('pipeline', queryset=PipelineStep.objects.order_by('stage', 'order'))))
+
+
+# Create your views here.
+class PositionListCreateView(ListCreateAPIView):
+    serializer_class = PositionSerializer
+    pagination_class = IdKeysetPagination
+
+    def get_queryset(self):
+        queryset = Position.objects.filter(job_posting__active=True)
+        client = self.request.query_params.get('client')
+        if client:
+            try:
+                queryset = queryset.filter(client_id=int(client))
+            except ValueError:
+                raise ValidationError({'client': ['Expected a client id.']})
+        return with_read_relations(queryset)
+
+    def get_permissions(self):
+        if self.request.method == 'POST':
+            return [IsHiringManager()]
+        return [IsAuthenticated()]
+
+
+class PositionDetailView(RetrieveAPIView):
+    queryset = with_read_relations(Position.objects.all())
+    serializer_class = PositionSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_field = 'pk'
+
+
+# POST /api/position/<pk>/pipeline/reorder/ with {"steps": [{"id", "stage", "order"}, ...]}
+class PipelineReorderView(APIView):
+    permission_classes = [IsHiringManager]
+
+    def post(self, request, pk):
+        serializer = PipelineReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        get_object_or_404(Position.objects.only('id'), pk=pk)
+        try:
+            reorder_pipeline(pk, serializer.validated_data['steps'])
+        except ReorderError as e:
+            return Response({'steps': [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        steps = PipelineStep.objects.filter(position_id=pk).order_by('stage', 'order')
+        return Response(PipelineStepSerializer(steps, many=True).data, status=status.HTTP_200_OK)
@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models import Count, F, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThanOrEqual
+from django.utils import timezone
+
+from core.models import JobPosting, PRFApproval
+from job.signals import job_postings_changed
+from prf.summary import schedule_prf_summary_refresh
+
+
+def approved_count(prf_id):
+    return PRFApproval.objects.filter(prf_id=prf_id, decision='approved').count()
+
+
+def _approved_subquery(prf_id):
+    return Subquery(
+        PRFApproval.objects.filter(prf_id=prf_id, decision='approved')
+        .order_by().values('prf').annotate(total=Count('pk')).values('total')
+    )
+
+
+# INSERT ... ON CONFLICT (prf_id, manager_id) DO UPDATE: repeating a vote is a no-op,
+# changing it flips the existing row. No read-modify-write, so concurrent voters never collide.
+def record_decision(prf, manager, decision):
+    PRFApproval.objects.bulk_create(
+        [PRFApproval(prf=prf, manager=manager, decision=decision)],
+        update_conflicts=True,
+        unique_fields=['prf', 'manager'],
+        update_fields=['decision', 'updated_at'],
+    )
+    schedule_prf_summary_refresh([prf.pk])
+    if decision == 'approved':
+        # Runs after commit so the count sees this vote; when every manager approves at once,
+        # the last commit's UPDATE sees all of them
+        transaction.on_commit(lambda: activate_if_approved(prf.pk, prf.job_posting_id))
+
+
+# UPDATE job_posting SET status = 'active' WHERE id = ? AND status = 'pending'
+#   AND (SELECT COUNT(*) FROM approvals WHERE prf_id = ? AND decision = 'approved') >= threshold
+# Only pending postings are activated (closed, cancelled and draft ones stay put), and the
+# status guard makes concurrent activations race to a single winner.
+def activate_if_approved(prf_id, job_posting_id):
+    activated = JobPosting.objects.filter(
+        GreaterThanOrEqual(_approved_subquery(prf_id), JobPosting.PRF_APPROVAL_THRESHOLD),
+        pk=job_posting_id,
+        type='prf',
+        status='pending',
+    ).update(status='active', version=F('version') + 1, updated_at=timezone.now())
+
+    if activated:
+        job_postings_changed.send(sender=JobPosting, ids=[job_posting_id], fields=['status'])
+    return bool(activated)
+
+
+# Current status and approval count in one query, for the approve/reject responses
+def approval_summary(prf_id):
+    return (
+        JobPosting.objects.filter(prf__id=prf_id)
+        .annotate(approvals=Coalesce(_approved_subquery(prf_id), 0))
+        .values('status', 'approvals')
+        .first()
+    )
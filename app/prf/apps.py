@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PrfConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'prf'
+
+    def ready(self):
+        import prf.signals  # noqa: F401
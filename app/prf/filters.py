@@ -0,0 +1,68 @@
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+
+from core.models import PRF, PRFSummary, User, AssessmentType, HardwareRequirement, SoftwareRequirement, JobPosting
+
+
+def _hiring_manager_id(params):
+    hiring_manager = params.get('hiring_manager')
+    if not hiring_manager:
+        return None
+    try:
+        return int(hiring_manager)
+    except ValueError:
+        raise ValidationError({'hiring_manager': ['Expected a user id.']})
+
+
+# Shared by PrfAV and exports; `params` is any mapping with .get()
+def filter_prfs(params):
+    qs = PRF.objects.filter(job_posting__active=True)
+
+    business_unit = params.get('business_unit')
+    status = params.get('status')
+    hiring_manager = _hiring_manager_id(params)
+
+    if business_unit:
+        qs = qs.filter(business_unit=business_unit)
+    if status:
+        qs = qs.filter(job_posting__status=status)
+    if hiring_manager is not None:
+        qs = qs.filter(hiring_managers=hiring_manager)
+
+    return qs.order_by('id')
+
+
+# Everything PRFSerializer reads, in a fixed number of queries (1 + 4 prefetches) for any page size
+def with_read_relations(queryset):
+    prf_fields = [field.name for field in PRF._meta.concrete_fields]
+    job_posting_fields = [f'job_posting__{field.name}' for field in JobPosting._meta.concrete_fields
+                          if field.name != 'search_vector']
+
+    return (queryset
+            .select_related('job_posting', 'immediate_supervisor')
+            .only(*prf_fields, *job_posting_fields,
+                  'immediate_supervisor__first_name', 'immediate_supervisor__last_name')
+            .prefetch_related(
+                Prefetch('hiring_managers', queryset=User.objects.only('id')),
+                Prefetch('assessment_types', queryset=AssessmentType.objects.only('id', 'name', 'prfs_id')),
+                Prefetch('hardware_requirements', queryset=HardwareRequirement.objects.only('id', 'name', 'prfs_id')),
+                Prefetch('software_requirements', queryset=SoftwareRequirement.objects.only('id', 'name', 'prfs_id')),
+            ))
+
+
+# Same parameters as filter_prfs, answered from the PRFSummary read model without joins
+def filter_prf_summaries(params):
+    qs = PRFSummary.objects.filter(active=True)
+
+    business_unit = params.get('business_unit')
+    status = params.get('status')
+    hiring_manager = _hiring_manager_id(params)
+
+    if business_unit:
+        qs = qs.filter(business_unit=business_unit)
+    if status:
+        qs = qs.filter(status=status)
+    if hiring_manager is not None:
+        qs = qs.filter(hiring_manager_ids__contains=[hiring_manager])
+
+    return qs
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import PRF, PRFSummary
+from prf.summary import refresh_prf_summaries, verify_prf_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the PRFSummary read model from scratch, or check it against the source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--verify', action='store_true',
+                            help='Report stale, missing and orphaned rows without writing')
+
+    def _batches(self, batch_size):
+        last_id = 0
+        while True:
+            ids = list(PRF.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if options['verify']:
+            stale, missing = [], []
+            for ids in self._batches(batch_size):
+                batch_stale, batch_missing = verify_prf_summaries(ids)
+                stale.extend(batch_stale)
+                missing.extend(batch_missing)
+            orphaned = PRFSummary.objects.exclude(prf_id__in=PRF.objects.values('id')).count()
+
+            self.stdout.write(f'Stale: {len(stale)}, missing: {len(missing)}, orphaned: {orphaned}')
+            if stale:
+                self.stdout.write(f'Stale PRF ids (first 50): {stale[:50]}')
+            if missing:
+                self.stdout.write(f'Missing PRF ids (first 50): {missing[:50]}')
+            if stale or missing or orphaned:
+                raise CommandError('PRF summaries are out of date; run rebuild_prf_summaries.')
+            self.stdout.write(self.style.SUCCESS('PRF summaries are consistent.'))
+            return
+
+        total = sum(refresh_prf_summaries(ids) for ids in self._batches(batch_size))
+        PRFSummary.objects.exclude(prf_id__in=PRF.objects.values('id')).delete()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} PRF summary row(s).'))
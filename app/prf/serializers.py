@@ -1,28 +1,26 @@
 from django.db import transaction
 from rest_framework import serializers
 
-from core.models import PRF, AssessmentType, HardwareRequirement, SoftwareRequirement, JobPosting
+from core.audit import diff, record_change
+from core.concurrency import (
+    PreconditionRequired, changed_fields, conditional_update, expected_version, supplied_version,
+)
+from core.sync import sync_children
+from prf.approvals import approved_count
+from prf.summary import schedule_prf_summary_refresh
+from core.models import PRF, PRFSummary, AssessmentType, HardwareRequirement, SoftwareRequirement, JobPosting, User
 from job.serializers import JobPostingSerializer
+from job.signals import job_postings_changed
+
+# A new PRF's posting waits for approvals (see prf.approvals); it cannot start out active or closed
+PRF_INITIAL_STATUSES = ('draft', 'pending')
 
 # Helper Function
-def _update_related_items(instance, data, model_class, relation_name):
-    if data is None:
-        return
-
-    for item in data:
-        if isinstance(item, dict):
-            item_id = item.get('id')
-            name = item.get('name')
-            if item_id:
-                try:
-                    obj = model_class.objects.get(id=item_id, prfs=instance)
-                    obj.name = name
-                    obj.save()
-                except model_class.DoesNotExist:
-                    pass
-            else:
-                # Either create new item if no id provided but for now pass
-                pass
+def _sync_related_items(instance, data, model_class, relation_name):
+    try:
+        return sync_children(instance, data, model_class, 'prfs')
+    except ValueError as e:
+        raise serializers.ValidationError({relation_name: [str(e)]})
 
 class AssessmentTypeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -39,8 +37,86 @@ class SoftwareRequirementSerializer(serializers.ModelSerializer):
         model = SoftwareRequirement
         fields = ['id', 'name']
 
+class PreloadedUserField(serializers.PrimaryKeyRelatedField):
+    # Resolves against users loaded once by PRFListSerializer instead of one query per value
+    def to_internal_value(self, data):
+        preloaded = self.context.get('preloaded_users')
+        if preloaded is None:
+            return super().to_internal_value(data)
+        try:
+            user = preloaded.get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if user is None:
+            self.fail('does_not_exist', pk_value=data)
+        return user
+
+
+class PRFListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        user_ids = set()
+        for item in data if isinstance(data, list) else []:
+            if not isinstance(item, dict):
+                continue
+            values = [item.get('immediate_supervisor')]
+            if isinstance(item.get('hiring_managers'), list):
+                values.extend(item['hiring_managers'])
+            for value in values:
+                try:
+                    user_ids.add(int(value))
+                except (TypeError, ValueError):
+                    pass
+        self.context['preloaded_users'] = User.objects.in_bulk(user_ids)
+        return super().to_internal_value(data)
+
+    @transaction.atomic
+    def create(self, validated_data):
+        # One bulk INSERT per table instead of ~15 round trips per PRF
+        user = self.context['request'].user
+        items = [dict(item) for item in validated_data]
+
+        job_postings = JobPosting.objects.bulk_create([
+            JobPosting(**{**item.pop('job_posting'), 'posted_by': user, 'type': 'prf'}) for item in items
+        ])
+
+        children = []
+        prfs = []
+        for item, job_posting in zip(items, job_postings):
+            children.append((
+                item.pop('hiring_managers', []),
+                item.pop('assessment_types', []),
+                item.pop('hardware_requirements', []),
+                item.pop('software_requirements', []),
+            ))
+            prfs.append(PRF(job_posting=job_posting, **item))
+        PRF.objects.bulk_create(prfs)
+
+        through = PRF.hiring_managers.through
+        # A manager listed twice for one PRF would violate the (prf, user) unique constraint
+        through.objects.bulk_create([
+            through(prf_id=prf.id, user_id=manager_id)
+            for prf, (managers, *_rest) in zip(prfs, children)
+            for manager_id in dict.fromkeys(manager.id for manager in managers)
+        ])
+        AssessmentType.objects.bulk_create([
+            AssessmentType(prfs=prf, name=name) for prf, (_, names, _h, _s) in zip(prfs, children) for name in names
+        ])
+        HardwareRequirement.objects.bulk_create([
+            HardwareRequirement(prfs=prf, name=name) for prf, (_, _a, names, _s) in zip(prfs, children) for name in names
+        ])
+        SoftwareRequirement.objects.bulk_create([
+            SoftwareRequirement(prfs=prf, name=name) for prf, (_, _a, _h, names) in zip(prfs, children) for name in names
+        ])
+
+        job_postings_changed.send(sender=JobPosting, ids=[job_posting.id for job_posting in job_postings],
+                                  fields=[field.name for field in JobPosting._meta.concrete_fields])
+        return prfs
+
+
 class PRFSerializer(serializers.ModelSerializer):
     job_posting = JobPostingSerializer()
+    immediate_supervisor = PreloadedUserField(queryset=User.objects.all(), required=False, allow_null=True)
+    hiring_managers = PreloadedUserField(queryset=User.objects.all(), many=True, required=False)
 
     # Write-only fields for creation
     assessment_types = serializers.ListField(write_only=True, required=False)
@@ -57,7 +133,15 @@ class PRFSerializer(serializers.ModelSerializer):
     class Meta:
         model = PRF
         fields = '__all__'
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'version']
+        list_serializer_class = PRFListSerializer
+
+    def validate_job_posting(self, value):
+        # Also runs per item for bulk creates; updates change status through JobPosting.set_status
+        if self.instance is None and value.get('status', 'pending') not in PRF_INITIAL_STATUSES:
+            raise serializers.ValidationError(
+                {'status': [f'A new PRF must start as one of: {", ".join(PRF_INITIAL_STATUSES)}.']})
+        return value
 
     def get_immediate_supervisor_display(self, obj):
         if obj.immediate_supervisor:
@@ -103,31 +187,56 @@ class PRFSerializer(serializers.ModelSerializer):
         software_requirements_data = validated_data.pop('software_requirements', None)
         hiring_managers_data = validated_data.pop('hiring_managers', None)
 
-        if job_posting_data:
-            new_status = job_posting_data.get('status')
-            if new_status and new_status != instance.job_posting.status:
-                # Fix the logic later if approval logic is implemented
-                approved_by_managers = validated_data.get('approved_by_managers', 0)
+        # The PRF version (If-Match or "version") guards the PRF and its child lists. Claim it first
+        # with a conditional UPDATE; a concurrent editor gets 412, not a lost update.
+        request = self.context.get('request')
+        initial_data = getattr(self, 'initial_data', None)
+        expected = expected_version(request, instance, supplied_version(initial_data))
+        prf_changes = changed_fields(instance, validated_data)
+        history = diff(instance, prf_changes)
+        conditional_update(instance, expected, prf_changes)
+
+        job_posting = instance.job_posting
+        job_posting_changes = changed_fields(job_posting, job_posting_data)
+        if job_posting_changes:
+            # The job posting is also editable on its own, so it is guarded by the version the client
+            # sent for it (job_posting.version), not by one read in this request
+            nested_data = initial_data.get('job_posting') if isinstance(initial_data, dict) else None
+            if supplied_version(nested_data) is None:
+                raise PreconditionRequired('Send job_posting.version with job posting changes.')
+            job_posting_expected = expected_version(None, job_posting, supplied_version(nested_data))
+            job_posting_history = diff(job_posting, job_posting_changes)
+
+            if 'status' in job_posting_changes:
+                # Approvals are counted from PRFApproval rows, never taken from the request body
                 try:
-                    instance.job_posting.set_status(new_status, approved_by_managers)
+                    job_posting.set_status(job_posting_changes['status'], approved_count(instance.pk), commit=False)
                 except ValueError as e:
                     raise serializers.ValidationError({'detail': str(e)})
-                job_posting_data.pop('status')
-            for attr, value in job_posting_data.items():
-                setattr(instance.job_posting, attr, value)
-            instance.job_posting.save()
 
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+            conditional_update(job_posting, job_posting_expected, job_posting_changes)
+            job_postings_changed.send(sender=JobPosting, ids=[job_posting.pk], fields=list(job_posting_changes))
+            record_change('job_posting', job_posting.pk, job_posting_history, getattr(request, 'user', None))
 
         if hiring_managers_data is not None:
+            old_ids = sorted(instance.hiring_managers.values_list('id', flat=True))
+            new_ids = sorted({manager.pk for manager in hiring_managers_data})
+            if old_ids != new_ids:
+                history['hiring_managers'] = [old_ids, new_ids]
             instance.hiring_managers.set(hiring_managers_data)
 
-        _update_related_items(instance, assessment_types_data, AssessmentType, 'assessment_types')
-        _update_related_items(instance, hardware_requirements_data, HardwareRequirement, 'hardware_requirements')
-        _update_related_items(instance, software_requirements_data, SoftwareRequirement, 'software_requirements')
-
+        for data, model_class, relation_name in (
+            (assessment_types_data, AssessmentType, 'assessment_types'),
+            (hardware_requirements_data, HardwareRequirement, 'hardware_requirements'),
+            (software_requirements_data, SoftwareRequirement, 'software_requirements'),
+        ):
+            result = _sync_related_items(instance, data, model_class, relation_name)
+            if result.changed:
+                history[relation_name] = [result.before, result.after]
+
+        # The conditional UPDATE and the child sync bypass post_save
+        schedule_prf_summary_refresh([instance.pk])
+        record_change('prf', instance.pk, history, getattr(request, 'user', None))
         return instance
 
     def destroy(self, instance):
@@ -136,3 +245,11 @@ class PRFSerializer(serializers.ModelSerializer):
 
         return instance
 
+
+
+class PRFSummarySerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='prf_id', read_only=True)
+
+    class Meta:
+        model = PRFSummary
+        exclude = ['prf']
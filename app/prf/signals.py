@@ -0,0 +1,75 @@
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.models import PRF, PRFApproval, JobPosting, User, AssessmentType, HardwareRequirement, SoftwareRequirement
+from job.signals import job_postings_changed
+from prf.summary import JOB_POSTING_FIELDS, schedule_prf_summary_refresh
+
+# Requirement rows deliberately have no post_delete receiver: it would disable the fast
+# DELETE that core.sync relies on. Bulk paths schedule their own refresh instead.
+
+
+@receiver(post_save, sender=PRF)
+def refresh_prf_summary(sender, instance, **kwargs):
+    schedule_prf_summary_refresh([instance.pk])
+
+
+@receiver(post_save, sender=AssessmentType)
+@receiver(post_save, sender=HardwareRequirement)
+@receiver(post_save, sender=SoftwareRequirement)
+def refresh_prf_summary_for_requirement(sender, instance, **kwargs):
+    schedule_prf_summary_refresh([instance.prfs_id])
+
+
+@receiver(post_save, sender=PRFApproval)
+def refresh_prf_summary_for_approval(sender, instance, **kwargs):
+    schedule_prf_summary_refresh([instance.prf_id])
+
+
+@receiver(post_save, sender=JobPosting)
+def refresh_prf_summary_for_job_posting(sender, instance, created, update_fields=None, **kwargs):
+    if created or instance.type != 'prf':
+        return
+    if update_fields is not None and not set(update_fields) & JOB_POSTING_FIELDS:
+        return
+    schedule_prf_summary_refresh(PRF.objects.filter(job_posting_id=instance.pk).values_list('id', flat=True))
+
+
+@receiver(job_postings_changed, sender=JobPosting)
+def refresh_prf_summaries_bulk(sender, ids, fields, **kwargs):
+    if set(fields) & JOB_POSTING_FIELDS:
+        schedule_prf_summary_refresh(PRF.objects.filter(job_posting_id__in=ids).values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=PRF.hiring_managers.through)
+def refresh_prf_summary_for_managers(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            schedule_prf_summary_refresh([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        schedule_prf_summary_refresh(pk_set)
+    elif action == 'pre_clear':
+        schedule_prf_summary_refresh(instance.prf_hiring_managers.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=User)
+def refresh_prf_summaries_for_user(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is not None and not {'first_name', 'last_name'} & set(update_fields):
+        return
+    schedule_prf_summary_refresh(
+        PRF.objects.filter(immediate_supervisor=instance).values_list('id', flat=True).union(
+            PRF.objects.filter(hiring_managers=instance).values_list('id', flat=True))
+    )
+
+
+# Deleting a user nulls immediate_supervisor and removes their manager and approval rows without
+# any save or m2m_changed signal, so the affected PRFs are read here, before those rows are gone
+@receiver(pre_delete, sender=User)
+def refresh_prf_summaries_for_deleted_user(sender, instance, **kwargs):
+    schedule_prf_summary_refresh(list(
+        PRF.objects.filter(immediate_supervisor=instance).values_list('id', flat=True).union(
+            PRF.objects.filter(hiring_managers=instance).values_list('id', flat=True),
+            PRFApproval.objects.filter(manager=instance).values_list('prf_id', flat=True))
+    ))
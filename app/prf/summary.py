@@ -0,0 +1,135 @@
+import threading
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+
+from core.models import PRF, PRFSummary, PRFApproval, AssessmentType, HardwareRequirement, SoftwareRequirement
+
+# Columns recomputed on every refresh (everything except the key and refreshed_at)
+SUMMARY_FIELDS = [
+    'job_posting_id', 'job_title', 'department_name', 'status', 'active', 'business_unit', 'position',
+    'category', 'number_of_vacancies', 'target_start_date', 'immediate_supervisor_name', 'hiring_manager_ids',
+    'hiring_manager_names', 'assessment_type_count', 'hardware_requirement_count', 'software_requirement_count',
+    'approval_count', 'created_at',
+]
+
+# JobPosting columns copied into the summary; job_postings_changed with any of these triggers a refresh
+JOB_POSTING_FIELDS = {'job_title', 'department_name', 'status', 'active', 'target_start_date', 'created_at'}
+
+
+def _count(model, fk_name, **filters):
+    return Coalesce(Subquery(
+        model.objects.filter(**{fk_name: OuterRef('pk')}, **filters)
+        .order_by().values(fk_name).annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+def _full_name(prefix):
+    return Concat(f'{prefix}first_name', Value(' '), f'{prefix}last_name')
+
+
+# One query for any number of PRFs: scalar subqueries for the manager lists and counts,
+# so the joins never multiply rows
+def build_summaries(prf_ids):
+    managers = PRF.hiring_managers.through.objects.filter(prf_id=OuterRef('pk')).order_by().values('prf_id')
+    rows = (
+        PRF.objects.filter(id__in=prf_ids)
+        .annotate(
+            supervisor_name=_full_name('immediate_supervisor__'),
+            manager_ids=Subquery(managers.annotate(ids=ArrayAgg('user_id')).values('ids')),
+            manager_names=Subquery(managers.annotate(names=ArrayAgg(_full_name('user__'))).values('names')),
+            assessment_type_count=_count(AssessmentType, 'prfs'),
+            hardware_requirement_count=_count(HardwareRequirement, 'prfs'),
+            software_requirement_count=_count(SoftwareRequirement, 'prfs'),
+            approval_count=_count(PRFApproval, 'prf', decision='approved'),
+        )
+        .values(
+            'id', 'job_posting_id', 'business_unit', 'position', 'category', 'number_of_vacancies',
+            'job_posting__job_title', 'job_posting__department_name', 'job_posting__status',
+            'job_posting__active', 'job_posting__target_start_date', 'job_posting__created_at',
+            'immediate_supervisor_id', 'supervisor_name', 'manager_ids', 'manager_names',
+            'assessment_type_count', 'hardware_requirement_count', 'software_requirement_count', 'approval_count',
+        )
+    )
+
+    summaries = []
+    for row in rows:
+        managers_sorted = sorted(zip(row['manager_ids'] or [], row['manager_names'] or []))
+        summaries.append(PRFSummary(
+            prf_id=row['id'],
+            job_posting_id=row['job_posting_id'],
+            job_title=row['job_posting__job_title'] or '',
+            department_name=row['job_posting__department_name'] or '',
+            status=row['job_posting__status'] or '',
+            active=bool(row['job_posting__active']),
+            business_unit=row['business_unit'],
+            position=row['position'],
+            category=row['category'],
+            number_of_vacancies=row['number_of_vacancies'],
+            target_start_date=row['job_posting__target_start_date'],
+            immediate_supervisor_name=row['supervisor_name'].strip() if row['immediate_supervisor_id'] else '',
+            hiring_manager_ids=[manager_id for manager_id, _name in managers_sorted],
+            hiring_manager_names=[name.strip() for _id, name in managers_sorted],
+            assessment_type_count=row['assessment_type_count'],
+            hardware_requirement_count=row['hardware_requirement_count'],
+            software_requirement_count=row['software_requirement_count'],
+            approval_count=row['approval_count'],
+            created_at=row['job_posting__created_at'],
+        ))
+    return summaries
+
+
+# Recompute the rows for `prf_ids` with one SELECT and one INSERT ... ON CONFLICT DO UPDATE
+def refresh_prf_summaries(prf_ids):
+    prf_ids = set(prf_ids)
+    if not prf_ids:
+        return 0
+
+    summaries = build_summaries(prf_ids)
+    PRFSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=['prf'],
+        update_fields=SUMMARY_FIELDS + ['refreshed_at'],
+    )
+    missing = prf_ids - {summary.prf_id for summary in summaries}
+    if missing:
+        PRFSummary.objects.filter(prf_id__in=missing).delete()
+    return len(summaries)
+
+
+_pending = threading.local()
+
+
+# Collects ids for the current thread and refreshes them once after commit, so a PRF save
+# followed by its requirement and manager writes costs one refresh instead of one per signal.
+# Ids left behind by a rolled-back transaction are refreshed at the next commit, which is harmless.
+def schedule_prf_summary_refresh(prf_ids):
+    pending = getattr(_pending, 'ids', None)
+    if pending is None:
+        pending = _pending.ids = set()
+    pending.update(prf_id for prf_id in prf_ids if prf_id is not None)
+    transaction.on_commit(_flush_pending)
+
+
+def _flush_pending():
+    prf_ids = getattr(_pending, 'ids', None)
+    if prf_ids:
+        _pending.ids = set()
+        refresh_prf_summaries(prf_ids)
+
+
+# Stored rows that differ from a fresh computation: (stale ids, missing ids)
+def verify_prf_summaries(prf_ids):
+    expected = {summary.prf_id: summary for summary in build_summaries(prf_ids)}
+    stored = {summary.prf_id: summary for summary in PRFSummary.objects.filter(prf_id__in=prf_ids)}
+
+    stale = [
+        prf_id for prf_id, summary in expected.items()
+        if prf_id in stored and any(getattr(summary, field) != getattr(stored[prf_id], field)
+                                    for field in SUMMARY_FIELDS)
+    ]
+    missing = [prf_id for prf_id in expected if prf_id not in stored]
+    return stale, missing
@@ -1,3 +1,357 @@
-from django.test import TestCase
+import io
+import threading
+from datetime import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import (PRF, PRFApproval, PRFSummary, JobPosting, User, AssessmentType, HardwareRequirement,
+                         SoftwareRequirement)
+from job.signals import job_postings_changed
+from job.tests import job_posting_values, make_hiring_manager
+from prf.approvals import activate_if_approved
+from prf.summary import refresh_prf_summaries, verify_prf_summaries
+
+
+def prf_values(**fields):
+    values = {
+        'business_unit': 'oodc',
+        'number_of_vacancies': 2,
+        'interview_levels': 2,
+        'category': 'Sales',
+        'position': 'Associate',
+        'work_schedule_from': time(9),
+        'work_schedule_to': time(18),
+        'salary_budget': '30000.00',
+        'other_assessment': ['Interview'],
+    }
+    values.update(fields)
+    return values
+
+
+def prf_payload(**fields):
+    job_posting = job_posting_values(status='pending')
+    for read_only in ('type', 'published'):
+        job_posting.pop(read_only)
+    payload = prf_values(job_posting=job_posting, assessment_types=['Written'], hardware_requirements=['Laptop'],
+                         software_requirements=['Office'])
+    payload.update(fields)
+    return payload
+
+
+# Creates `count` PRFs with their job postings, managers and requirement rows in a handful of queries
+def make_prfs(count, hiring_managers=(), **fields):
+    job_postings = JobPosting.objects.bulk_create([
+        JobPosting(**job_posting_values(job_title=f'Associate {index}', status='pending', type='prf'))
+        for index in range(count)
+    ])
+    prfs = PRF.objects.bulk_create([PRF(**prf_values(job_posting=job_posting, **fields))
+                                    for job_posting in job_postings])
+    PRF.hiring_managers.through.objects.bulk_create([
+        PRF.hiring_managers.through(prf=prf, user=manager) for prf in prfs for manager in hiring_managers
+    ])
+    for model in (AssessmentType, HardwareRequirement, SoftwareRequirement):
+        model.objects.bulk_create([model(prfs=prf, name=name) for prf in prfs for name in ('first', 'second')])
+    return prfs
+
+
+class PrfListQueryTests(TestCase):
+    def setUp(self):
+        self.manager = make_hiring_manager()
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def _page_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_query_count_does_not_grow_with_the_number_of_prfs(self):
+        created = 0
+        for total in (1, 10, 1000):
+            make_prfs(total - created, hiring_managers=[self.manager])
+            created = total
+
+            response, queries = self._page_queries('/api/prf/?page_size=100')
+            self.assertEqual(len(response.data['results']), min(total, 100))
+            # One page query plus one per prefetched relation
+            self.assertEqual(queries, 5, f'{total} PRFs')
+
+            response, queries = self._page_queries(f'/api/prf/?page_size=100&hiring_manager={self.manager.id}')
+            self.assertEqual(len(response.data['results']), min(total, 100))
+            self.assertEqual(queries, 5, f'{total} PRFs filtered by manager')
+
+    def test_non_numeric_hiring_manager_is_a_400(self):
+        for url in ('/api/prf/?hiring_manager=abc', '/api/prf/summary/?hiring_manager=abc'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn('hiring_manager', response.data)
+
+        response = self.client.post('/api/export/', {'kind': 'prfs', 'format': 'csv',
+                                                      'filters': {'hiring_manager': 'abc'}}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('filters', response.data)
+
+
+class PrfBulkCreateTests(TestCase):
+    def setUp(self):
+        self.manager = make_hiring_manager()
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def _create(self, count):
+        other = make_hiring_manager(f'other{count}@example.com')
+        response = self.client.post('/api/prf/', [prf_payload(hiring_managers=[self.manager.id, other.id])
+                                                  for _ in range(count)], format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(response.data), count)
+
+    def test_statement_count_does_not_grow_with_the_batch(self):
+        with CaptureQueriesContext(connection) as single:
+            self._create(1)
+        with self.assertNumQueries(len(single)):
+            self._create(25)
+        self.assertEqual(PRF.objects.count(), 26)
+        self.assertEqual(AssessmentType.objects.count(), 26)
+        self.assertEqual(PRF.hiring_managers.through.objects.count(), 52)
+
+    def test_manager_listed_twice_is_linked_once(self):
+        other = make_hiring_manager('other@example.com')
+        payload = [prf_payload(hiring_managers=[self.manager.id, self.manager.id, other.id]),
+                   prf_payload(hiring_managers=[other.id, other.id])]
+        response = self.client.post('/api/prf/', payload, format='json')
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual([sorted(row['hiring_managers']) for row in response.data],
+                         [sorted([self.manager.id, other.id]), [other.id]])
+
+    def test_only_hiring_managers_create_or_delete(self):
+        user = User.objects.create_user('staff@example.com', 'password', first_name='Staff', last_name='User',
+                                        role='manager')
+        self.client.force_authenticate(user)
+        prf = make_prfs(1)[0]
+
+        self.assertEqual(self.client.post('/api/prf/', [prf_payload()], format='json').status_code, 403)
+        self.assertEqual(self.client.post('/api/prf/', prf_payload(), format='json').status_code, 403)
+        self.assertEqual(self.client.delete('/api/prf/', {'ids': [prf.id]}, format='json').status_code, 403)
+        self.assertTrue(PRF.objects.filter(id=prf.id).exists())
+        self.assertEqual(self.client.get('/api/prf/').status_code, 200)
+
+
+class PrfUpdateTests(TestCase):
+    def setUp(self):
+        self.manager = make_hiring_manager()
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+        self.prf = make_prfs(1)[0]
+        self.url = f'/api/prf/{self.prf.id}/'
+        self.etag = self.client.get(self.url)['ETag']
+
+    def test_status_change_is_saved(self):
+        response = self.client.patch(self.url, {'job_posting': {'status': 'closed', 'version': 1}}, format='json',
+                                     HTTP_IF_MATCH=self.etag)
+        self.assertEqual(response.status_code, 200, response.data)
+        job_posting = JobPosting.objects.get(id=self.prf.job_posting_id)
+        self.assertEqual(job_posting.status, 'closed')
+        self.assertEqual(job_posting.version, 2)
+
+    def test_status_rules_still_apply(self):
+        response = self.client.patch(self.url, {'job_posting': {'status': 'active', 'version': 1}}, format='json',
+                                     HTTP_IF_MATCH=self.etag)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(JobPosting.objects.get(id=self.prf.job_posting_id).status, 'pending')
+
+    def test_writes_without_a_version_are_refused(self):
+        response = self.client.patch(self.url, {'position': 'Lead'}, format='json')
+        self.assertEqual(response.status_code, 428)
+
+        # The PRF version does not vouch for the job posting, which is also editable on its own
+        response = self.client.patch(self.url, {'job_posting': {'job_title': 'Lead'}}, format='json',
+                                     HTTP_IF_MATCH=self.etag)
+        self.assertEqual(response.status_code, 428)
+        self.assertEqual(PRF.objects.get(id=self.prf.id).version, 1)
+
+    def test_version_in_the_body_works_like_if_match(self):
+        response = self.client.patch(self.url, {'position': 'Lead', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.patch(self.url, {'position': 'Head', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(PRF.objects.get(id=self.prf.id).position, 'Lead')
+
+    def test_stale_job_posting_version_is_412(self):
+        JobPosting.objects.get(id=self.prf.job_posting_id).set_status('closed')  # Edited elsewhere: version 2
+        response = self.client.patch(self.url, {'job_posting': {'job_title': 'Lead', 'version': 1}}, format='json',
+                                     HTTP_IF_MATCH=self.etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(JobPosting.objects.get(id=self.prf.job_posting_id).job_title, 'Associate 0')
+
+
+# Committed history is written synchronously, so nothing is left queued once the test database is gone
+@mock.patch('core.audit.WRITE_BEHIND', False)
+class PrfConcurrentUpdateTests(TransactionTestCase):
+    WRITERS = 8
+
+    def test_concurrent_writers_on_one_version_lose_nothing_silently(self):
+        manager = make_hiring_manager()
+        prf = make_prfs(1)[0]
+        url = f'/api/prf/{prf.id}/'
+        barrier = threading.Barrier(self.WRITERS)
+        results = {}
+
+        def write(index):
+            client = APIClient()
+            client.force_authenticate(manager)
+            try:
+                barrier.wait()
+                response = client.patch(url, {'position': f'Writer {index}'}, format='json', HTTP_IF_MATCH=f'"{prf.id}-1"')
+                results[index] = response.status_code
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=write, args=(index,)) for index in range(self.WRITERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        winners = [index for index, status_code in results.items() if status_code == 200]
+        self.assertEqual(len(winners), 1, results)
+        self.assertEqual(sorted(results.values()), [200] + [412] * (self.WRITERS - 1))
+        prf.refresh_from_db()
+        self.assertEqual(prf.position, f'Writer {winners[0]}')
+        self.assertEqual(prf.version, 2)
+
+
+class PrfApprovalTests(TestCase):
+    def setUp(self):
+        self.managers = [make_hiring_manager(f'manager{index}@example.com') for index in range(3)]
+        self.prf = make_prfs(1, hiring_managers=self.managers)[0]
+
+    def _approve_all(self):
+        for manager in self.managers:
+            client = APIClient()
+            client.force_authenticate(manager)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(f'/api/prf/{self.prf.id}/approve/')
+            self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_threshold_activates_a_pending_posting(self):
+        response = self._approve_all()
+        self.assertEqual(response.data['approvals'], 3)
+        self.assertEqual(JobPosting.objects.get(id=self.prf.job_posting_id).status, 'active')
+
+    def test_closed_cancelled_and_draft_postings_are_not_reopened(self):
+        for status in ('closed', 'cancelled', 'draft'):
+            JobPosting.objects.filter(id=self.prf.job_posting_id).update(status=status)
+            PRFApproval.objects.filter(prf=self.prf).delete()
+            self._approve_all()
+            self.assertFalse(activate_if_approved(self.prf.id, self.prf.job_posting_id))
+            self.assertEqual(JobPosting.objects.get(id=self.prf.job_posting_id).status, status)
+
+    def test_new_prfs_cannot_start_active(self):
+        client = APIClient()
+        client.force_authenticate(self.managers[0])
+        active = prf_payload()
+        active['job_posting']['status'] = 'active'
+
+        response = client.post('/api/prf/', active, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = client.post('/api/prf/', [prf_payload(), active], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(PRF.objects.count(), 1)
+
+        response = client.post('/api/prf/', prf_payload(), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['job_posting']['status'], 'pending')
+
+
+@mock.patch('core.audit.WRITE_BEHIND', False)
+class PrfConcurrentApprovalTests(TransactionTestCase):
+    MANAGERS = 6
+
+    def test_parallel_approvals_activate_the_posting_once(self):
+        managers = [make_hiring_manager(f'manager{index}@example.com') for index in range(self.MANAGERS)]
+        prf = make_prfs(1, hiring_managers=managers)[0]
+        barrier = threading.Barrier(self.MANAGERS)
+        lock = threading.Lock()
+        results, activations = {}, []
+
+        def on_change(sender, ids, fields, **kwargs):
+            if fields == ['status']:
+                with lock:
+                    activations.append(ids)
+
+        def approve(manager):
+            client = APIClient()
+            client.force_authenticate(manager)
+            try:
+                barrier.wait()
+                results[manager.id] = client.post(f'/api/prf/{prf.id}/approve/').status_code
+            finally:
+                connection.close()
+
+        job_postings_changed.connect(on_change, sender=JobPosting)
+        self.addCleanup(job_postings_changed.disconnect, on_change, sender=JobPosting)
+        threads = [threading.Thread(target=approve, args=(manager,)) for manager in managers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(list(results.values()), [200] * self.MANAGERS)
+        self.assertEqual(PRFApproval.objects.filter(prf=prf, decision='approved').count(), self.MANAGERS)
+        # Every vote's after-commit check ran, but only one moved the posting from pending to active
+        self.assertEqual(activations, [[prf.job_posting_id]])
+        job_posting = JobPosting.objects.get(id=prf.job_posting_id)
+        self.assertEqual(job_posting.status, 'active')
+        self.assertEqual(job_posting.version, 2)
+        self.assertFalse(activate_if_approved(prf.id, prf.job_posting_id))
+
+
+class PrfSummaryTests(TestCase):
+    def setUp(self):
+        self.supervisor = make_hiring_manager('supervisor@example.com')
+        self.managers = [make_hiring_manager(f'manager{index}@example.com') for index in range(2)]
+        self.prfs = make_prfs(2, hiring_managers=self.managers, immediate_supervisor=self.supervisor)
+        PRFApproval.objects.bulk_create([PRFApproval(prf=prf, manager=self.managers[1], decision='approved')
+                                         for prf in self.prfs])
+        self.prf_ids = [prf.id for prf in self.prfs]
+        refresh_prf_summaries(self.prf_ids)
+
+    def test_deleting_a_user_refreshes_their_prfs(self):
+        summary = PRFSummary.objects.get(prf=self.prfs[0])
+        self.assertEqual(summary.immediate_supervisor_name, 'Hiring Manager')
+        self.assertEqual(summary.approval_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.supervisor.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.managers[1].delete()
+
+        for summary in PRFSummary.objects.filter(prf_id__in=self.prf_ids):
+            self.assertEqual(summary.immediate_supervisor_name, '')
+            self.assertEqual(summary.hiring_manager_ids, [self.managers[0].id])
+            self.assertEqual(summary.approval_count, 0)
+        self.assertEqual(verify_prf_summaries(self.prf_ids), ([], []))
+
+    def test_rebuild_command_verifies_and_repairs(self):
+        out = io.StringIO()
+        call_command('rebuild_prf_summaries', '--verify', stdout=out)
+        self.assertIn('PRF summaries are consistent.', out.getvalue())
+
+        PRFSummary.objects.filter(prf=self.prfs[0]).update(position='Stale')
+        PRFSummary.objects.filter(prf=self.prfs[1]).delete()
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_prf_summaries', '--verify', stdout=out)
+        self.assertIn('Stale: 1, missing: 1, orphaned: 0', out.getvalue())
+
+        call_command('rebuild_prf_summaries', '--batch-size', '1', stdout=io.StringIO())
+        self.assertEqual(verify_prf_summaries(self.prf_ids), ([], []))
+        self.assertEqual(PRFSummary.objects.get(prf=self.prfs[0]).position, 'Associate')
@@ -1,6 +1,12 @@
 from django.urls import path
+
+from core.views import ChangeHistoryView
 from . import views
 urlpatterns = [
     path('', views.PrfAV.as_view(), name='prf-list-create'),
-    path('<int:pk>/', views.PrfDetails.as_view(), name='prf-details-update-delete')
+    path('summary/', views.PrfSummaryView.as_view(), name='prf-summary-list'),
+    path('<int:pk>/', views.PrfDetails.as_view(), name='prf-details-update-delete'),
+    path('<int:pk>/approve/', views.PrfApprovalView.as_view(decision='approved'), name='prf-approve'),
+    path('<int:pk>/reject/', views.PrfApprovalView.as_view(decision='rejected'), name='prf-reject'),
+    path('<int:pk>/history/', ChangeHistoryView.as_view(object_type='prf'), name='prf-history'),
 ]
\ No newline at end of file
@@ -1,29 +1,42 @@
 from django.db import transaction
+from django.shortcuts import get_object_or_404
 from rest_framework import status
-from rest_framework.generics import RetrieveUpdateDestroyAPIView
+from rest_framework.generics import ListAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from auth.permissions import IsHiringManager
-from core.models import PRF
-from prf.serializers import PRFSerializer
+from core.concurrency import VersionETagMixin
+from core.models import PRF, JobPosting
+from core.pagination import IdKeysetPagination, KeysetPagination
+from prf.approvals import approval_summary, record_decision
+from prf.filters import filter_prfs, filter_prf_summaries, with_read_relations
+from prf.serializers import PRFSerializer, PRFSummarySerializer
 
 
+BULK_CREATE_LIMIT = 1000
+
 # Create your views here.
 
 class PrfAV(APIView):
     def get_permissions(self):
-        if self.request.method == 'POST' and self.request.method == 'DELETE':
+        if self.request.method in ('POST', 'DELETE'):
             return [IsHiringManager()]
         return [IsAuthenticated()]
 
     def get(self, request):
-        prfs = PRF.objects.filter(job_posting__active=True)
-        serializer = PRFSerializer(prfs, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        prfs = with_read_relations(filter_prfs(request.query_params))
+
+        paginator = IdKeysetPagination()
+        page = paginator.paginate_queryset(prfs, request, view=self)
+        serializer = PRFSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+
         serializer = PRFSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save()
@@ -31,6 +44,16 @@ class PrfAV(APIView):
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def bulk_create(self, request):
+        serializer = PRFSerializer(data=request.data, many=True, max_length=BULK_CREATE_LIMIT,
+                                   context={'request': request})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        prfs = serializer.save()
+        created = with_read_relations(PRF.objects.filter(id__in=[prf.id for prf in prfs]).order_by('id'))
+        return Response(PRFSerializer(created, many=True).data, status=status.HTTP_201_CREATED)
+
     def delete(self, request):
         ids = request.data.pop('ids', None)
 
@@ -41,12 +64,48 @@ class PrfAV(APIView):
 
         return Response({'error': 'Invalid data. "ids" should be a list of PRF IDs.'}, status=status.HTTP_400_BAD_REQUEST)
 
-class PrfDetails(RetrieveUpdateDestroyAPIView):
-    queryset = PRF.objects.filter(job_posting__active=True)
+class PrfSummaryPagination(KeysetPagination):
+    ordering = ('-prf_id',)
+
+
+# Dashboard list: one indexed scan of PRFSummary per page, no joins or prefetches
+class PrfSummaryView(ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = PRFSummarySerializer
+    pagination_class = PrfSummaryPagination
+
+    def get_queryset(self):
+        return filter_prf_summaries(self.request.query_params)
+
+class PrfDetails(VersionETagMixin, RetrieveUpdateDestroyAPIView):
+    queryset = with_read_relations(PRF.objects.filter(job_posting__active=True))
     serializer_class = PRFSerializer
     lookup_field = 'pk'
 
     def get_permissions(self):
         if self.request.method == 'PATCH':
             return [IsHiringManager()]
-        return [IsAuthenticated()]
\ No newline at end of file
+        return [IsAuthenticated()]
+
+# POST /api/prf/<pk>/approve/ and /reject/. Idempotent: re-sending a vote leaves one row per manager.
+class PrfApprovalView(APIView):
+    permission_classes = [IsAuthenticated]
+    decision = None
+
+    def post(self, request, pk):
+        prf = get_object_or_404(PRF.objects.only('id', 'job_posting_id'), pk=pk, job_posting__active=True)
+        if not prf.hiring_managers.filter(pk=request.user.pk).exists():
+            return Response({'detail': 'Only hiring managers assigned to this PRF can vote on it.'},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        with transaction.atomic():
+            record_decision(prf, request.user, self.decision)
+
+        summary = approval_summary(prf.pk)
+        return Response({
+            'prf': prf.pk,
+            'decision': self.decision,
+            'approvals': summary['approvals'],
+            'required': JobPosting.PRF_APPROVAL_THRESHOLD,
+            'status': summary['status'],
+        }, status=status.HTTP_200_OK)
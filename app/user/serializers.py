@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from auth.hashing import hashing_pool
 from core.models import User
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -15,7 +16,9 @@ class UserSerializer(serializers.ModelSerializer):
         password = validated_data.pop('password', None)
         user = User(**validated_data)
         if password:
-            user.set_password(password)  # This properly hashes the password
+            # Same as set_password(), with the hashing done on the bounded pool
+            user.password = hashing_pool.make_password(password)
+            user._password = password
         user.save()
         return user
 
@@ -8,6 +8,7 @@ from auth.authentication import CookieJWTAuthentication
 from auth.permissions import IsSuperAdmin, IsHiringManager
 from user.serializers import UserSerializer
 from core.models import User
+from core.pagination import IdKeysetPagination, is_cursor_mode
 
 
 # Create your views here.
@@ -31,5 +32,11 @@ class UserViewAV(APIView):
         else:
             users = User.objects.filter(is_active=True)
 
+        if is_cursor_mode(request):
+            paginator = IdKeysetPagination()
+            page = paginator.paginate_queryset(users, request, view=self)
+            serializer = UserSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = UserSerializer(users, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file